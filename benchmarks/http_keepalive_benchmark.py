@@ -0,0 +1,88 @@
+"""
+Local stub-server benchmark: per-call requests.post (new connection every call)
+vs pooled HTTPTransport (keep-alive, warm connections).
+
+Usage:
+    python benchmarks/http_keepalive_benchmark.py [number_of_requests]
+"""
+import os
+import sys
+import time
+import json
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Get the absolute path to the root directory of your project
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the project root to sys.path
+sys.path.append(project_root)
+
+from src.api.http_transport import HTTPTransport
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """ Minimal JSON endpoint speaking HTTP/1.1, so connections can be kept alive. """
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately - without TCP_NODELAY delayed ACKs would dominate the kept-alive path
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps({"data": [{"index": 0, "embedding": [0.0] * 8}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(send, url: str, requests_count: int) -> list:
+    """ Return list of per-call latencies in milliseconds. """
+    payload = {"model": "stub", "input": "Hello World"}
+    latencies = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        response = send(url, json=payload)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<28} mean {statistics.mean(latencies):7.3f} ms | p50 {statistics.median(latencies):7.3f} ms | "
+          f"p95 {p95:7.3f} ms | total {sum(latencies) / 1000:6.2f} s")
+
+
+def main():
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/embeddings"
+
+    transport = HTTPTransport()
+    try:
+        # Warm up both paths
+        measure(requests.post, url, 10)
+        measure(transport.post, url, 10)
+
+        print(f"{requests_count} POST requests to local stub server")
+        report("requests.post (per call)", measure(requests.post, url, requests_count))
+        report("HTTPTransport (keep-alive)", measure(transport.post, url, requests_count))
+    finally:
+        transport.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Tag extraction benchmark: per-call pattern building (previous TextProcessor implementation)
+vs precompiled pattern registry, and three separate extractions vs one extract_tags scan.
+
+Responses are synthetic LLM outputs with reasoning text followed by <answer>, <keywords>
+and <Result> tags, from small to large.
+
+Usage:
+    python benchmarks/regex_extraction_benchmark.py [number_of_repeats]
+"""
+import os
+import re
+import sys
+import time
+import random
+
+# Get the absolute path to the root directory of your project
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the project root to sys.path
+sys.path.append(project_root)
+
+from src.utils.text_processor import TextProcessor
+
+TAGS = ["answer", "keywords", "Result"]
+
+
+def old_extract(text: str, tag: str) -> str:
+    """ Previous implementation - pattern built from f-string and looked up / compiled on every call. """
+    pattern = rf"<{tag}>(.*?)</{tag}>"
+    match = re.search(pattern, text, re.DOTALL)
+    return match.group(1).strip() if match else ""
+
+
+def old_extract_cold(text: str, tag: str) -> str:
+    """ Previous implementation when re module cache is evicted (many different patterns in process). """
+    re.purge()
+    return old_extract(text, tag)
+
+
+def make_response(size_chars: int, seed: int = 0) -> str:
+    random_generator = random.Random(seed)
+    words = ["robot", "Barbara", "sektor", "fabryka", "analiza", "<b>", "raport", "x < y", "odpowiedź"]
+    body = []
+    length = 0
+    while length < size_chars:
+        word = random_generator.choice(words)
+        body.append(word)
+        length += len(word) + 1
+    return (
+        "<thinking>" + " ".join(body) + "</thinking>\n"
+        "<answer>Sektor C4</answer>\n"
+        "<keywords>robot, Barbara, fabryka</keywords>\n"
+        "<Result>{\"status\": \"ok\"}</Result>"
+    )
+
+
+def measure(function, repeats: int) -> float:
+    """ Return mean time of one call in microseconds. """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'response size':>14} | {'old x3':>10} | {'old x3 cold':>12} | {'new x3':>10} | {'extract_tags':>12}")
+    for size in (1_000, 10_000, 100_000, 1_000_000):
+        text = make_response(size)
+        expected = {tag: old_extract(text, tag) for tag in TAGS}
+        assert TextProcessor.extract_tags(text, TAGS) == expected
+        assert {tag: TextProcessor.extract_text_between_tags(text, tag) for tag in TAGS} == expected
+
+        count = max(5, repeats * 1_000 // size)
+        old = measure(lambda: [old_extract(text, tag) for tag in TAGS], count)
+        cold = measure(lambda: [old_extract_cold(text, tag) for tag in TAGS], count)
+        new = measure(lambda: [TextProcessor.extract_text_between_tags(text, tag) for tag in TAGS], count)
+        single_scan = measure(lambda: TextProcessor.extract_tags(text, TAGS), count)
+        print(f"{size:>14,} | {old:>8.1f}us | {cold:>10.1f}us | {new:>8.1f}us | {single_scan:>10.1f}us")
+
+    text = ", ".join(["robot", "Barbara", "sektor C4"] * 2_000)
+    count = repeats * 10
+    old_split = measure(lambda: [token.strip() for token in re.split(r",\s+", text) if token.strip()], count)
+    new_split = measure(lambda: TextProcessor.tokenize_text(text), count)
+    print(f"\ntokenize_text of {len(text):,} chars: re.split {old_split:.1f}us, registry {new_split:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
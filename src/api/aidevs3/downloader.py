@@ -9,15 +9,17 @@ sys.path.append(project_root)
 import logging
 import requests
 from src.api.aidevs3.client import Aidevs3Client
+from src.api.http_transport import HTTPTransport, get_transport
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
 
 class Downloader:
     """ Class for download file """
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, transport: HTTPTransport = None):
         self.filename = filename
         self.client = Aidevs3Client()
+        self.transport = transport or get_transport()
         self.api_key = self.client.get_api_key()
         self.data_url = self.client.get_data_url()
         self.dane_url = self.client.get_dane_url()
@@ -31,7 +33,7 @@ class Downloader:
         :return: True if download was successful
         """
         try:
-            response = requests.get(self.request_url)
+            response = self.transport.get(self.request_url)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logging.error(f"Error during download file: {e}")
@@ -55,7 +57,7 @@ class Downloader:
         """
 
         try:
-            response = requests.get(self.request_url)
+            response = self.transport.get(self.request_url)
             print(self.request_url)
             response.raise_for_status()
             data = response.json()
@@ -76,7 +78,7 @@ class Downloader:
         :return: Dict representig TXT data or None if error occurs.
         """
         try:
-            response = requests.get(self.request_url)
+            response = self.transport.get(self.request_url)
             response.raise_for_status()
 
             ## Printing headers and them values
@@ -101,7 +103,7 @@ class Downloader:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.transport.get(url, headers=headers, timeout=10)
             response.raise_for_status()
 
             logging.info(f"Successfully downloaded content from {url}")
@@ -127,7 +129,7 @@ class Downloader:
         """
         try:
             request_url = os.path.join(self.dane_url, image_url)
-            response = requests.get(request_url)
+            response = self.transport.get(request_url)
             response.raise_for_status()
 
             # Ensure that saving direcotry exists
@@ -10,18 +10,21 @@ import logging
 import requests
 import json
 from src.api.aidevs3.client import Aidevs3Client
+from src.api.http_transport import HTTPTransport, get_transport
 
 class Uploader:
     """
-    Class responsible for sending response to server
+    Class responsible for sending response to server.
+    Answers are sent as non-idempotent POST requests - they are retried only when the server surely did not receive them.
 
     :param task_name: - Name of the taks
     :param data: - Data to sent to the server
     """
 
-    def __init__(self, taks_name: str):
+    def __init__(self, taks_name: str, transport: HTTPTransport = None):
         self.task_name = taks_name
         self.client = Aidevs3Client()
+        self.transport = transport or get_transport()
         self._api_key = self.client.get_api_key()
         self.response_url = self.client.get_endpoint_url()
         self.db_url = self.client.get_db_url()
@@ -40,14 +43,18 @@ class Uploader:
         }
 
         try:
-            response = requests.post(self.response_url, json=payload)
+            response = self.transport.post(self.response_url, json=payload)
             response.raise_for_status()
             response_data = response.json()
             logging.info("Data was sent successfully.")
             logging.info(f"Server response: {response_data}")
             return True
         except requests.exceptions.RequestException as e:
-            logging.error(f"Error during sending data: {e} , resp status_code: {response.status_code} : {response.text}")
+            # e.response is None when the request never got a response (e.g. connection error after retries)
+            if e.response is not None:
+                logging.error(f"Error during sending data: {e} , resp status_code: {e.response.status_code} : {e.response.text}")
+            else:
+                logging.error(f"Error during sending data: {e}")
             return False
 
 
@@ -65,14 +72,18 @@ class Uploader:
         }
 
         try:
-            response = requests.post(self.response_url, json=payload)
+            response = self.transport.post(self.response_url, json=payload)
             response.raise_for_status()
             response_data = response.json()
             logging.info("Data was sent successfully.")
             logging.info(f"Server response: {response_data}")
             return response_data
         except requests.exceptions.RequestException as e:
-            logging.error(f"Error during sending data: {e} , resp status_code: {response.status_code} : {response.text}")
+            # e.response is None when the request never got a response (e.g. connection error after retries)
+            if e.response is not None:
+                logging.error(f"Error during sending data: {e} , resp status_code: {e.response.status_code} : {e.response.text}")
+            else:
+                logging.error(f"Error during sending data: {e}")
             return None
 
 
@@ -90,12 +101,16 @@ class Uploader:
         }
 
         try:
-            response = requests.post(self.db_url, json=payload)
+            response = self.transport.post(self.db_url, json=payload)
             response.raise_for_status()
             response_data = response.json()
             logging.info("Data was sent successfully.")
             logging.info(f"Server response: {response_data}")
             return response_data
         except requests.exceptions.RequestException as e:
-            logging.error(f"Error during sending data: {e} , resp status_code: {response.status_code} : {response.text}")
+            # e.response is None when the request never got a response (e.g. connection error after retries)
+            if e.response is not None:
+                logging.error(f"Error during sending data: {e} , resp status_code: {e.response.status_code} : {e.response.text}")
+            else:
+                logging.error(f"Error during sending data: {e}")
             return None
@@ -0,0 +1,321 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.api.retry import RetryPolicy
+
+
+class HTTPTransport:
+    """
+    Shared HTTP transport for API clients.
+
+    Keeps one pooled requests.Session per host, so consecutive calls to the same
+    server reuse warm TCP/TLS connections (HTTP keep-alive) instead of opening
+    a new connection for every request.
+
+    Usage example:
+    transport = get_transport()
+    response = transport.post("https://api.openai.com/v1/embeddings", headers=headers, json=payload)
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 32,
+            timeout: Union[float, Tuple[float, float]] = (10.0, 300.0),
+            pool_block: bool = False,
+            retry_policy: Optional[RetryPolicy] = None
+    ) -> None:
+        """
+        Parameters:
+            pool_connections (int) : Number of connection pools cached by every session
+            pool_maxsize (int) : Maximum number of kept-alive connections per host - should match number of worker threads
+            timeout (float or (connect, read)) : Default timeout used when call does not pass its own
+            pool_block (bool) : If True, callers wait for a free connection instead of opening an extra one
+            retry_policy (RetryPolicy, Optional) : Policy for transient failures, default RetryPolicy() if None
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.pool_block = pool_block
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """ Create session with pooled adapters mounted for http and https. """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Return pooled session for host of given URL, creating it on first use.
+
+        Parameters:
+            url (str) : Request URL
+
+        Returns:
+            requests.Session : Session shared by all requests to the same scheme, host and port
+        """
+        parts = urlsplit(url)
+        host_key = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(host_key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host_key)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[host_key] = session
+                    logging.debug(f"Created pooled HTTP session for {host_key}")
+        return session
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send single request through pooled session, without retries.
+        Accepts the same keyword arguments as requests.request.
+
+        Returns:
+            requests.Response : Server response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, deadline: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send request through pooled session, retrying transient failures with the retry policy.
+        Accepts the same keyword arguments as requests.request.
+
+        Parameters:
+            idempotent (bool, Optional) : If request can be safely repeated, by default derived from HTTP method (POST is not)
+            deadline (float, Optional) : Seconds after which no retry is started, policy default if None
+
+        Returns:
+            requests.Response : Server response
+        """
+        if idempotent is None:
+            idempotent = RetryPolicy.is_idempotent(method)
+        return self.retry_policy.execute(
+            lambda: self.send(method, url, **kwargs),
+            idempotent=idempotent,
+            deadline=deadline
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """ Close all pooled sessions and their connections. """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class AsyncHTTPTransport:
+    """
+    Shared asynchronous HTTP transport built on a single pooled httpx.AsyncClient.
+
+    All coroutines of the process share one keep-alive connection pool. The client
+    is bound to an event loop, so it is created lazily on first use and recreated
+    (the stale one is closed) when it is used from a different loop, e.g. consecutive
+    asyncio.run calls.
+
+    Users sharing the transport register with acquire() and give it back with release() -
+    the pool is closed when the last user releases it. aclose() closes it unconditionally
+    and is meant for the owner of a private transport.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 32,
+            keepalive_expiry: float = 30.0,
+            timeout: Union[float, Tuple[float, float]] = (10.0, 300.0),
+            retry_policy: Optional[RetryPolicy] = None
+    ) -> None:
+        """
+        Parameters:
+            max_connections (int) : Maximum number of concurrent connections
+            max_keepalive_connections (int) : Number of idle connections kept alive for reuse
+            keepalive_expiry (float) : Seconds after which idle connection is closed
+            timeout (float or (connect, read)) : Default request timeout
+            retry_policy (RetryPolicy, Optional) : Policy for transient failures, default RetryPolicy() if None
+        """
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            self.timeout = httpx.Timeout(timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._guard = None
+        self._users = 0
+        self._users_lock = threading.Lock()
+
+    @staticmethod
+    async def _close_stale(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """ Close client created in another event loop. """
+        if client.is_closed:
+            return
+        try:
+            if loop is not None and loop.is_running() and not loop.is_closed():
+                # Loop still runs in another thread - close connections there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            else:
+                await client.aclose()
+        except Exception as e:
+            # Sockets of a closed loop can not be closed gracefully anymore - they are released with the client
+            logging.debug(f"Could not close async HTTP client of previous event loop: {e}")
+
+    @staticmethod
+    async def _loop_guard(client: httpx.AsyncClient):
+        """
+        Async generator started together with the client. Event loops finalize unfinished async
+        generators before they close (asyncio.run does), so the client is closed inside its own loop.
+        """
+        try:
+            yield
+        finally:
+            if not client.is_closed:
+                await client.aclose()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """ Return pooled client for the running event loop. """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            stale_client, stale_loop = self._client, self._loop
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._loop = loop
+            self._guard = self._loop_guard(self._client)
+            await self._guard.__anext__()
+            if stale_client is not None:
+                await self._close_stale(stale_client, stale_loop)
+            logging.debug("Created pooled async HTTP client")
+        return self._client
+
+    async def send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send single request through pooled client, without retries.
+        Accepts the same keyword arguments as httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response : Server response
+        """
+        client = await self._get_client()
+        return await client.request(method, url, **kwargs)
+
+    async def request(self, method: str, url: str, idempotent: Optional[bool] = None, deadline: Optional[float] = None, **kwargs) -> httpx.Response:
+        """
+        Send request through pooled client, retrying transient failures with the retry policy.
+        Accepts the same keyword arguments as httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response : Server response
+        """
+        if idempotent is None:
+            idempotent = RetryPolicy.is_idempotent(method)
+        return await self.retry_policy.execute_async(
+            lambda: self.send(method, url, **kwargs),
+            idempotent=idempotent,
+            deadline=deadline
+        )
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def acquire(self) -> None:
+        """ Register user of the shared transport. """
+        with self._users_lock:
+            self._users += 1
+
+    async def release(self) -> None:
+        """ Unregister user, the pool is closed when no registered user is left. """
+        with self._users_lock:
+            self._users = max(0, self._users - 1)
+            last = self._users == 0
+        if last:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """ Close pooled client and its connections, also when it was created in another event loop. """
+        client, loop, guard = self._client, self._loop, self._guard
+        self._client = None
+        self._loop = None
+        self._guard = None
+        if client is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await guard.aclose()
+        else:
+            await self._close_stale(client, loop)
+
+
+_default_transport: Optional[HTTPTransport] = None
+_default_async_transport: Optional[AsyncHTTPTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """ Return process-wide transport shared by all API clients. """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = HTTPTransport()
+    return _default_transport
+
+
+def configure_transport(**kwargs) -> HTTPTransport:
+    """
+    Replace process-wide transport with a new one built from given settings.
+    Clients created afterwards use the new transport.
+
+    Parameters:
+        kwargs : Arguments passed to HTTPTransport (pool_connections, pool_maxsize, timeout, pool_block, retry_policy)
+
+    Returns:
+        HTTPTransport : New shared transport
+    """
+    global _default_transport
+    with _default_transport_lock:
+        previous = _default_transport
+        _default_transport = HTTPTransport(**kwargs)
+    if previous is not None:
+        previous.close()
+    return _default_transport
+
+
+def get_async_transport() -> AsyncHTTPTransport:
+    """ Return process-wide asynchronous transport shared by all async API clients. """
+    global _default_async_transport
+    if _default_async_transport is None:
+        with _default_transport_lock:
+            if _default_async_transport is None:
+                _default_async_transport = AsyncHTTPTransport()
+    return _default_async_transport
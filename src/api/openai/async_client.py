@@ -0,0 +1,212 @@
+import os
+import asyncio
+import logging
+from typing import Any, Awaitable, Iterable, List, Optional
+from dotenv import load_dotenv
+from src.utils.file_handler import FileHandler
+from src.api.http_transport import AsyncHTTPTransport, get_async_transport
+from src.api.retry import RetryPolicy
+from src.api.openai.errors import OpenAIAPIError, RateLimitError
+from src.api.openai.rate_limiter import RateLimiter, get_rate_limiter
+
+
+class AsyncOpenAIClient:
+    """
+    Asynchronous counterpart of OpenAIClient.
+
+    Every method is a coroutine mirroring the synchronous client. Requests share one
+    pooled async HTTP connection pool and a semaphore limits how many of them are
+    in flight at once.
+
+    Usage example:
+    async def main():
+        client = AsyncOpenAIClient(max_concurrency=8)
+        tasks = [client.generate_response(system_prompt, paragraph, model="gpt-4o") for paragraph in paragraphs]
+        responses = await client.gather_responses(tasks)
+    """
+
+    def __init__(self, max_concurrency: int = 8, transport: Optional[AsyncHTTPTransport] = None, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Parameters:
+            max_concurrency (int) : Maximum number of requests sent to the API at the same time
+            transport (AsyncHTTPTransport, Optional) : Connection pool, process-wide pool is used if None
+            rate_limiter (RateLimiter, Optional) : RPM/TPM limiter, the one shared with OpenAIClient is used if None
+        """
+        load_dotenv()
+        self.api_key = self._get_env_var("OPEN_AI_API_KEY")
+        self.base_url = 'https://api.openai.com/v1'
+        self.transport = transport or get_async_transport()
+        # Transport may be shared with other clients - it is closed when the last of them is closed
+        self.transport.acquire()
+        self._closed = False
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.max_concurrency = max_concurrency
+        # Semaphore is bound to the event loop it is used in - created per loop, like the transport client
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_env_var(self, var_name: str) -> str:
+        value = os.getenv(var_name)
+        if not value:
+            raise ValueError(f"Environment variable {var_name} is not set.")
+        return value
+
+    def _headers(self):
+        # Returns authorization headers required for communication with the OpenAI API
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _handle_error(self, resposne):
+        ### Handles HTTP errors and displays error details ###
+        try:
+            error_data = resposne.json()
+            error_message = error_data.get("error", {}).get("message", "Unknown error")
+        except ValueError:
+            error_message = "Communication with OpenAI error."
+
+        if resposne.status_code == 429:
+            raise RateLimitError(resposne.status_code, error_message, RetryPolicy.retry_after(resposne))
+        raise OpenAIAPIError(resposne.status_code, error_message)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """ Return concurrency semaphore of the running event loop. """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _post(self, endpoint: str, payload: dict, idempotent: bool = False) -> dict:
+        """
+        Send request once a concurrency slot and rate limit budget are free and return decoded JSON response.
+        Transient failures are retried with the transport retry policy, the slot is released while waiting.
+        Timeouts and 5xx which may come after the work was done are retried only when idempotent is True.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        model = payload.get("model", endpoint)
+        tokens = self.rate_limiter.estimate_request_tokens(payload)
+
+        async def send():
+            async with self._get_semaphore():
+                await self.rate_limiter.acquire_async(model, tokens)
+                response = await self.transport.send("POST", url, headers=self._headers(), json=payload)
+            self.rate_limiter.update_from_headers(model, response.headers)
+            if response.status_code == 429:
+                self.rate_limiter.on_rate_limited(model, RetryPolicy.retry_after(response), response.headers)
+            return response
+
+        response = await self.transport.retry_policy.execute_async(send, idempotent=idempotent)
+
+        # Error handling
+        if response.status_code != 200:
+            self._handle_error(response)
+
+        return response.json()
+
+    async def generate_response(self, system_prompt: str="", message:str="", model:str='gpt-4', max_tokens:int=50, temperature:float=1.0, top_p:float=1.0) -> str:
+        """ Return model response based on prompt for selected model. """
+        payload = {
+            "model": model,
+            "messages":[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": message}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p
+        }
+        response_data = await self._post("chat/completions", payload)
+        return response_data.get("choices", [])[0].get("message", {}).get("content", "")
+
+    async def generate_image(self, prompt: str, img_size:str="1024x1024") -> str:
+        """ Generate an image besed on the provided prompt """
+        payload = {
+            "prompt": prompt,
+            "n": 1,
+            "size": img_size
+        }
+        response_data = await self._post("images/generations", payload)
+        return response_data.get("data", [])[0].get("url", "")
+
+    async def generate_visual_resposne(self, prompt: str, model: str = "gpt-4o", image_path: str = "", max_tokens: int=1000, temperature: float=1.0, top_p: float=1.0) -> str:
+        """ Return model response based on prompt for gpt-4-visual model."""
+        # Reading and encoding image is blocking - keep it off the event loop
+        base64_image = await asyncio.to_thread(FileHandler.load_image_base64, image_path)
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role":"user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt,
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": base64_image
+                            },
+                        },
+                    ],
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p
+        }
+        response_data = await self._post("chat/completions", payload)
+        return response_data.get("choices", [])[0].get("message", {}).get("content", "")
+
+    async def generate_embedding(self, text: str, model: str = "text-embedding-3-small") -> list:
+        """
+        Generate embeddings for the given text using OpenAI's models.
+
+        Parameters:
+            text (str) : Text based on which embedding will be generated.
+            model (str) : embedding model
+
+        Returns:
+            List[float] : List containing embedding vector
+        """
+        payload = {
+            "model": model,
+            "input": text
+        }
+        response_data = await self._post("embeddings", payload, idempotent=True)
+        return response_data.get("data",[])[0].get("embedding",[])
+
+    @staticmethod
+    async def gather_responses(coroutines: Iterable[Awaitable[Any]]) -> List[Any]:
+        """
+        Run coroutines concurrently and collect their results.
+
+        Results keep the order of given coroutines. A failing coroutine does not cancel
+        the others - its exception is returned in its place instead of the result.
+
+        Parameters:
+            coroutines (Iterable[Awaitable]) : Client calls to run, e.g. [client.generate_response(...), ...]
+
+        Returns:
+            List : Result or Exception for every coroutine, in input order
+        """
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        if failed:
+            logging.warning(f"{failed} of {len(results)} requests failed")
+        return results
+
+    async def aclose(self) -> None:
+        """ Release underlying connection pool - it is closed once no other client uses it. """
+        if self._closed:
+            return
+        self._closed = True
+        await self.transport.release()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
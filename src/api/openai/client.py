@@ -1,14 +1,31 @@
 import os
-import requests
+import logging
+import numpy as np
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 from src.utils.file_handler import FileHandler
+from src.utils.text_processor import TextProcessor
+from src.api.http_transport import HTTPTransport, get_transport
+from src.api.retry import RetryPolicy
+from src.api.openai.errors import OpenAIAPIError, RateLimitError
+from src.api.openai.rate_limiter import RateLimiter, get_rate_limiter
+from src.api.openai.response_cache import ResponseCache
+
+# Statuses meaning the request input was rejected - splitting the batch isolates the bad input
+EMBEDDING_INPUT_ERROR_STATUSES = {400, 413, 422}
 
 
 class OpenAIClient:
-    def __init__(self):
+    def __init__(self, transport: Optional[HTTPTransport] = None, rate_limiter: Optional[RateLimiter] = None, cache: Optional[ResponseCache] = None):
         load_dotenv()
         self.api_key = self._get_env_var("OPEN_AI_API_KEY")
         self.base_url = 'https://api.openai.com/v1'
+        # Pooled keep-alive connections shared with other API clients
+        self.transport = transport or get_transport()
+        # RPM/TPM budgets shared with other OpenAI clients (also async ones)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        # Opt-in cache of chat, vision and embedding responses
+        self.cache = cache
 
     def _get_env_var(self, var_name: str) -> str:
         value = os.getenv(var_name)
@@ -23,9 +40,48 @@ class OpenAIClient:
             "Content-Type": "application/json",
         }
     
+    def _post(self, endpoint: str, payload: dict, idempotent: bool = False):
+        """
+        Send request to API endpoint once it fits into the rate limit budget of the model.
+        Failures after which the server surely did nothing (429, 503, connection not established) are
+        always retried with the transport retry policy. Timeouts and other 5xx are retried only when
+        idempotent is True - the server may have already done (and billed) the generation.
+
+        Returns:
+            requests.Response : Server response, errors are handled by the caller
+        """
+        url = f"{self.base_url}/{endpoint}"
+        model = payload.get("model", endpoint)
+        tokens = self.rate_limiter.estimate_request_tokens(payload)
+
+        def send():
+            self.rate_limiter.acquire(model, tokens)
+            response = self.transport.send("POST", url, headers=self._headers(), json=payload)
+            self.rate_limiter.update_from_headers(model, response.headers)
+            if response.status_code == 429:
+                self.rate_limiter.on_rate_limited(model, RetryPolicy.retry_after(response), response.headers)
+            return response
+
+        return self.transport.retry_policy.execute(send, idempotent=idempotent)
+
+    def _cache_key(self, endpoint: str, payload: dict) -> Optional[str]:
+        """ Return cache key for request or None if caching is disabled. """
+        if self.cache is None:
+            return None
+        return ResponseCache.make_key(endpoint, payload)
+
+    def _cache_get(self, cache_key: Optional[str]):
+        if cache_key is None:
+            return None
+        return self.cache.get(cache_key)
+
+    def _cache_put(self, cache_key: Optional[str], value) -> None:
+        if cache_key is not None:
+            self.cache.put(cache_key, value)
+    
     def generate_response(self, system_prompt: str="", message:str="", model:str='gpt-4', max_tokens:int=50, temperature:float=1.0, top_p:float=1.0):
         # Returns model response based on prompt for selected model
-        url = f"{self.base_url}/chat/completions" # FUlly endpoint to response generation
+        endpoint = "chat/completions" # Endpoint to response generation
         payload = {
             "model": model,
             "messages":[
@@ -37,14 +93,21 @@ class OpenAIClient:
             "top_p": top_p
         }
 
-        response = requests.post(url, headers=self._headers(), json=payload)
+        cache_key = self._cache_key(endpoint, payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = self._post(endpoint, payload)
 
         # Error handling
         if response.status_code != 200:
             self._handle_error(response)
 
         response_data = response.json()
-        return response_data.get("choices", [])[0].get("message", {}).get("content", "")
+        content = response_data.get("choices", [])[0].get("message", {}).get("content", "")
+        self._cache_put(cache_key, content)
+        return content
     
 
     def _handle_error(self, resposne):
@@ -55,19 +118,21 @@ class OpenAIClient:
         except ValueError:
             error_message = "Communication with OpenAI error."
 
-        raise Exception(f"API Error ({resposne.status_code}): {error_message}")
+        if resposne.status_code == 429:
+            raise RateLimitError(resposne.status_code, error_message, RetryPolicy.retry_after(resposne))
+        raise OpenAIAPIError(resposne.status_code, error_message)
     
 
     def generate_image(self, prompt: str, img_size:str="1024x1024") -> str:
         """ Generate an image besed on the provided prompt """
-        url = f"{self.base_url}/images/generations"
+        endpoint = "images/generations"
         payload = {
             "prompt": prompt,
             "n": 1,
             "size": img_size
         }
 
-        response = requests.post(url, headers=self._headers(), json=payload)
+        response = self._post(endpoint, payload)
 
         # Error handling
         if response.status_code != 200:
@@ -77,11 +142,13 @@ class OpenAIClient:
         return response_data.get("data", [])[0].get("url", "")
     
 
-    def generate_visual_resposne(self, prompt: str, model: str = "gpt-4o", image_path: str = "", max_tokens: int=1000, temperature: float=1.0, top_p: float=1.0):
-        """ Return model response based on prompt for gpt-4-visual model."""
-        handler = FileHandler()
-        base64_image = handler.load_image_base64(image_path)
-        url = url = f"{self.base_url}/chat/completions"
+    def generate_visual_resposne(self, prompt: str, model: str = "gpt-4o", image_path: str = "", max_tokens: int=1000, temperature: float=1.0, top_p: float=1.0, image_data_url: Optional[str] = None):
+        """
+        Return model response based on prompt for gpt-4-visual model.
+        Pass image_data_url (see FileHandler.image_bytes_to_data_url) to skip reading and encoding image_path.
+        """
+        base64_image = image_data_url or FileHandler.load_image_base64(image_path)
+        endpoint = "chat/completions"
         payload = {
             "model": model,
             "messages": [
@@ -105,15 +172,23 @@ class OpenAIClient:
             "temperature": temperature,
             "top_p": top_p
         }
-        
-        response = requests.post(url, headers=self._headers(), json=payload)
+
+        # Key covers image bytes - they are part of the payload as base64 data URL
+        cache_key = self._cache_key(endpoint, payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = self._post(endpoint, payload)
 
         # Error Handling
         if response.status_code != 200:
             self._handle_error(response)
 
         response_data = response.json()
-        return response_data.get("choices", [])[0].get("message", {}).get("content", "")
+        content = response_data.get("choices", [])[0].get("message", {}).get("content", "")
+        self._cache_put(cache_key, content)
+        return content
     
 
     def generate_embedding(self, text: str, model: str = "text-embedding-3-small") -> list:
@@ -132,16 +207,144 @@ class OpenAIClient:
                      text-embedding-3-large
                      text-embedding-ada-002
         """
-        url = f"{self.base_url}/embeddings"
+        endpoint = "embeddings"
         payload = {
             "model": model,
             "input": text
         }
-        
-        response = requests.post(url, headers=self._headers(), json=payload)
+
+        cache_key = self._cache_key(endpoint, payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Embeddings are deterministic and cheap - repeating after a timeout is acceptable
+        response = self._post(endpoint, payload, idempotent=True)
 
         if response.status_code != 200:
             self._handle_error(response)
 
         response_data = response.json()
-        return response_data.get("data",[])[0].get("embedding",[])
+        embedding = response_data.get("data",[])[0].get("embedding",[])
+        self._cache_put(cache_key, embedding)
+        return embedding
+
+
+    def generate_embeddings(
+            self,
+            texts: List[str],
+            model: str = "text-embedding-3-small",
+            max_batch_tokens: int = 100_000,
+            max_batch_items: int = 2048,
+            errors: Optional[Dict[int, str]] = None
+    ) -> np.ndarray:
+        """
+        Generate embeddings for many texts, packing them into as few requests as possible.
+
+        Parameters:
+            texts (List[str]) : Texts based on which embeddings will be generated
+            model (str) : embedding model
+            max_batch_tokens (int) : Estimated token budget of a single request
+            max_batch_items (int) : Maximum number of inputs sent in a single request (OpenAI limit is 2048)
+            errors (Dict[int, str], Optional) : If given, failures do not raise - error message of each text
+                                                which could not be embedded is stored under its index
+                                                and its row is filled with NaN
+
+        Returns:
+            np.ndarray : float32 matrix of shape (len(texts), vector_size), row i is the embedding of texts[i]
+
+        Raises:
+            Exception: If a text can not be embedded and errors is not given
+
+        With cache enabled every text is cached separately (same key as generate_embedding),
+        only texts missing in the cache are sent to the API.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        cache_keys = [self._cache_key("embeddings", {"model": model, "input": text}) for text in texts]
+        vectors_by_index = {}
+        for index, cache_key in enumerate(cache_keys):
+            vector = self._cache_get(cache_key)
+            if vector is not None:
+                vectors_by_index[index] = vector
+        if vectors_by_index:
+            logging.info(f"Loaded {len(vectors_by_index)} of {len(texts)} embeddings from cache")
+        pending = [index for index in range(len(texts)) if index not in vectors_by_index]
+        pending_texts = [texts[index] for index in pending]
+
+        if pending_texts:
+            for start, end in self._pack_embedding_batches(pending_texts, max_batch_tokens, max_batch_items):
+                batch_errors = {} if errors is not None else None
+                vectors = self._embed_batch(pending_texts[start:end], model, batch_errors)
+                for offset, (index, vector) in enumerate(zip(pending[start:end], vectors)):
+                    if vector is None:
+                        errors[index] = batch_errors[offset]
+                        continue
+                    vectors_by_index[index] = vector
+                    self._cache_put(cache_keys[index], vector)
+                logging.info(f"Generated embeddings for {end} of {len(pending_texts)} inputs")
+            if errors:
+                logging.error(f"Embedding failed for {len(errors)} of {len(texts)} inputs")
+
+        dim = len(next(iter(vectors_by_index.values()))) if vectors_by_index else 0
+        matrix = np.full((len(texts), dim), np.nan, dtype=np.float32)
+        for index, vector in vectors_by_index.items():
+            matrix[index] = vector
+        return matrix
+
+
+    @staticmethod
+    def _pack_embedding_batches(texts: List[str], max_batch_tokens: int, max_batch_items: int) -> List[tuple]:
+        """ Split texts into contiguous (start, end) ranges which fit into the token and item budget. """
+        batches = []
+        start = 0
+        batch_tokens = 0
+        for index, text in enumerate(texts):
+            tokens = TextProcessor.estimate_tokens(text)
+            batch_size = index - start
+            if batch_size and (batch_size >= max_batch_items or batch_tokens + tokens > max_batch_tokens):
+                batches.append((start, index))
+                start = index
+                batch_tokens = 0
+            batch_tokens += tokens
+        batches.append((start, len(texts)))
+        return batches
+
+
+    def _embed_batch(self, batch: List[str], model: str, errors: Optional[Dict[int, str]] = None, offset: int = 0) -> List[Optional[List[float]]]:
+        """
+        Send one /embeddings request. A batch rejected because of its input (400, 413, 422) is split
+        in half and each half is sent on its own, until the failing input is isolated. Other failures
+        (429, 5xx after retries, auth) are not split - it would only multiply requests.
+
+        With errors given, failed inputs get None and their message under index offset + position,
+        otherwise the error is raised.
+        """
+        endpoint = "embeddings"
+        payload = {
+            "model": model,
+            "input": batch
+        }
+
+        try:
+            response = self._post(endpoint, payload, idempotent=True)
+            if response.status_code != 200:
+                if len(batch) > 1 and response.status_code in EMBEDDING_INPUT_ERROR_STATUSES:
+                    middle = len(batch) // 2
+                    logging.warning(f"Embedding batch of {len(batch)} inputs rejected ({response.status_code}), retrying as two sub-batches")
+                    return (
+                        self._embed_batch(batch[:middle], model, errors, offset)
+                        + self._embed_batch(batch[middle:], model, errors, offset + middle)
+                    )
+                self._handle_error(response)
+        except Exception as e:
+            if errors is None:
+                raise
+            for position in range(len(batch)):
+                errors[offset + position] = str(e)
+            return [None] * len(batch)
+
+        # API does not guarantee order of returned items - sort them by input index
+        response_data = sorted(response.json().get("data", []), key=lambda item: item["index"])
+        return [item["embedding"] for item in response_data]
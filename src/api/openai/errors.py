@@ -0,0 +1,18 @@
+from typing import Optional
+
+
+class OpenAIAPIError(Exception):
+    """ Error returned by the OpenAI API. """
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"API Error ({status_code}): {message}")
+
+
+class RateLimitError(OpenAIAPIError):
+    """ Request rejected with HTTP 429. retry_after holds server hint in seconds, if it was sent. """
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(status_code, message)
+        self.retry_after = retry_after
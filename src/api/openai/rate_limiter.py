@@ -0,0 +1,249 @@
+import re
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+
+from src.utils.text_processor import TextProcessor
+
+# Number of tokens billed for a single image in a vision request (high detail, 512px tiles) - upper estimate
+IMAGE_TOKENS_ESTIMATE = 765
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at capacity / period.
+
+    Reservations may drive the bucket below zero - the debt is the queue of callers
+    already waiting, so each new caller waits behind them instead of racing them.
+    Not thread-safe on its own; RateLimiter guards it with a lock.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        """
+        Parameters:
+            capacity (float) : Budget available per period (e.g. requests or tokens per minute)
+            period (float) : Length of the budget window in seconds
+        """
+        self.capacity = float(capacity)
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """ Refill speed in units per second. """
+        return self.capacity / self.period
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take amount from the bucket.
+
+        Returns:
+            float : Seconds the caller has to wait before the reservation is covered
+        """
+        self._refill(now)
+        # A single request larger than the whole budget can never fit - let it wait for a full bucket only
+        amount = min(amount, self.capacity)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], now: float) -> None:
+        """ Align bucket with server-side view of the budget. """
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            # Only lower the budget - local debt already accounts for requests still in flight
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter:
+    """
+    Client-side limiter of requests-per-minute and tokens-per-minute budgets, kept per model.
+
+    Before a request is sent, acquire() (or acquire_async()) reserves one request and
+    the estimated number of tokens and waits until both buckets cover them. After every
+    response update_from_headers() synchronizes budgets with x-ratelimit-* headers, and
+    on_rate_limited() pauses the model after a 429 so parallel workers do not retry in a storm.
+
+    One instance is shared by OpenAIClient and AsyncOpenAIClient (see get_rate_limiter()).
+    """
+
+    def __init__(
+            self,
+            requests_per_minute: int = 500,
+            tokens_per_minute: int = 200_000,
+            model_limits: Optional[Dict[str, Tuple[int, int]]] = None
+    ):
+        """
+        Parameters:
+            requests_per_minute (int) : Default RPM budget for models without own limits
+            tokens_per_minute (int) : Default TPM budget for models without own limits
+            model_limits (Dict[str, (rpm, tpm)], Optional) : Budgets for specific models, e.g. {"gpt-4o": (500, 30000)}
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.model_limits = dict(model_limits or {})
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _get_buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        """ Return (requests, tokens) buckets for model. Caller must hold the lock. """
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            rpm, tpm = self.model_limits.get(model, (self.requests_per_minute, self.tokens_per_minute))
+            buckets = (TokenBucket(rpm), TokenBucket(tpm))
+            self._buckets[model] = buckets
+        return buckets
+
+    def reserve(self, model: str, tokens: int) -> float:
+        """
+        Reserve one request and given number of tokens for model.
+
+        Returns:
+            float : Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            requests_bucket, tokens_bucket = self._get_buckets(model)
+            wait = max(requests_bucket.reserve(1, now), tokens_bucket.reserve(tokens, now))
+            blocked = self._blocked_until.get(model, 0.0) - now
+            return max(wait, blocked, 0.0)
+
+    def acquire(self, model: str, tokens: int) -> None:
+        """ Block current thread until request for model fits into the budget. """
+        wait = self.reserve(model, tokens)
+        if wait > 0:
+            logging.debug(f"Rate limiter: waiting {wait:.2f}s before request to {model}")
+            time.sleep(wait)
+
+    async def acquire_async(self, model: str, tokens: int) -> None:
+        """ Suspend current coroutine until request for model fits into the budget. """
+        wait = self.reserve(model, tokens)
+        if wait > 0:
+            logging.debug(f"Rate limiter: waiting {wait:.2f}s before request to {model}")
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        """
+        Synchronize budgets of model with x-ratelimit-* response headers.
+
+        Parameters:
+            model (str) : Model used by the request
+            headers (Mapping[str, str]) : Response headers (case-insensitive mapping)
+        """
+        limit_requests = self._parse_number(headers.get("x-ratelimit-limit-requests"))
+        limit_tokens = self._parse_number(headers.get("x-ratelimit-limit-tokens"))
+        remaining_requests = self._parse_number(headers.get("x-ratelimit-remaining-requests"))
+        remaining_tokens = self._parse_number(headers.get("x-ratelimit-remaining-tokens"))
+        if limit_requests is None and limit_tokens is None and remaining_requests is None and remaining_tokens is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            requests_bucket, tokens_bucket = self._get_buckets(model)
+            requests_bucket.sync(limit_requests, remaining_requests, now)
+            tokens_bucket.sync(limit_tokens, remaining_tokens, now)
+
+    def on_rate_limited(self, model: str, retry_after: Optional[float] = None, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Pause all requests to model after HTTP 429.
+
+        Parameters:
+            model (str) : Model which was rate limited
+            retry_after (float, Optional) : Server hint in seconds
+            headers (Mapping[str, str], Optional) : Response headers used when retry_after is not given
+
+        Returns:
+            float : Seconds for which the model is paused
+        """
+        if retry_after is None and headers is not None:
+            resets = [
+                self._parse_duration(headers.get("x-ratelimit-reset-requests")),
+                self._parse_duration(headers.get("x-ratelimit-reset-tokens"))
+            ]
+            resets = [reset for reset in resets if reset is not None]
+            retry_after = max(resets) if resets else None
+        pause = retry_after if retry_after is not None else 1.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until[model] = max(self._blocked_until.get(model, 0.0), now + pause)
+        logging.warning(f"Rate limit hit for {model}, pausing requests for {pause:.2f}s")
+        return pause
+
+    @staticmethod
+    def estimate_request_tokens(payload: dict) -> int:
+        """
+        Estimate number of tokens counted against TPM budget for request payload.
+        OpenAI counts prompt tokens plus max_tokens of completion.
+
+        Parameters:
+            payload (dict) : JSON payload of chat/completions or embeddings request
+
+        Returns:
+            int : Estimated number of tokens
+        """
+        tokens = 0
+        for message in payload.get("messages", []):
+            content = message.get("content", "")
+            if isinstance(content, str):
+                tokens += TextProcessor.estimate_tokens(content)
+                continue
+            for part in content:
+                if part.get("type") == "text":
+                    tokens += TextProcessor.estimate_tokens(part.get("text", ""))
+                elif part.get("type") == "image_url":
+                    tokens += IMAGE_TOKENS_ESTIMATE
+
+        model_input = payload.get("input")
+        if isinstance(model_input, str):
+            tokens += TextProcessor.estimate_tokens(model_input)
+        elif isinstance(model_input, list):
+            tokens += sum(TextProcessor.estimate_tokens(text) for text in model_input)
+
+        tokens += TextProcessor.estimate_tokens(payload.get("prompt", ""))
+        return tokens + payload.get("max_tokens", 0)
+
+    @staticmethod
+    def _parse_number(value: Optional[str]) -> Optional[float]:
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _parse_duration(value: Optional[str]) -> Optional[float]:
+        """ Parse OpenAI reset duration, e.g. '1s', '6m0s', '20ms'. """
+        if not value:
+            return None
+        parts = _DURATION_PART.findall(value)
+        if not parts:
+            return None
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+_default_rate_limiter: Optional[RateLimiter] = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """ Return process-wide rate limiter shared by synchronous and asynchronous OpenAI clients. """
+    global _default_rate_limiter
+    if _default_rate_limiter is None:
+        with _default_rate_limiter_lock:
+            if _default_rate_limiter is None:
+                _default_rate_limiter = RateLimiter()
+    return _default_rate_limiter
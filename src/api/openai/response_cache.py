@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of OpenAI responses.
+
+    Key is a SHA-256 hash of the endpoint and the full request payload (model, messages,
+    base64 image data, parameters), so identical requests share one entry. Entries are
+    stored in a local SQLite file with a TTL and evicted in least-recently-used order when
+    the file grows above max_size_bytes. A small in-memory LRU in front of SQLite serves
+    repeated hits without touching the disk. Access times of hits (memory hits too) are
+    collected in memory and written in one batch on put, before eviction, on close or
+    when enough of them accumulate, so hot entries are evicted last.
+
+    Usage example:
+    cache = ResponseCache("tasks/s03e01-key_words/.cache/openai.sqlite", ttl=7 * 24 * 3600)
+    client = OpenAIClient(cache=cache)
+    ...
+    print(cache.stats())
+    """
+
+    # Number of pending access time updates which triggers a write
+    ACCESS_FLUSH_ITEMS = 256
+
+    def __init__(
+            self,
+            path: str = ".cache/openai_responses.sqlite",
+            ttl: Optional[float] = 30 * 24 * 3600,
+            max_size_bytes: int = 512 * 1024 * 1024,
+            memory_items: int = 1024
+    ):
+        """
+        Parameters:
+            path (str) : Path of SQLite file, parent directory is created if needed
+            ttl (float, Optional) : Seconds after which entry expires, None means never
+            max_size_bytes (int) : Size of stored values above which least recently used entries are evicted
+            memory_items (int) : Number of entries kept in the in-memory LRU
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_size_bytes = max_size_bytes
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending_access: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._memory_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+        self._connection.commit()
+        self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def make_key(endpoint: str, payload: dict) -> str:
+        """
+        Build cache key for request.
+
+        Parameters:
+            endpoint (str) : API endpoint, e.g. 'chat/completions'
+            payload (dict) : Request JSON payload
+
+        Returns:
+            str : Hex SHA-256 digest of canonical JSON of endpoint and payload
+        """
+        canonical = json.dumps({"endpoint": endpoint, "payload": payload}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return cached value for key or None if missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and not self._expired(cached[1], now):
+                self._memory.move_to_end(key)
+                self._hits += 1
+                self._memory_hits += 1
+                self._touch(key, now)
+                return cached[0]
+
+            row = self._connection.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    self._delete(key)
+                self._misses += 1
+                return None
+
+            self._touch(key, now)
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store JSON-serializable value under key.
+        """
+        now = time.time()
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, size, now, now)
+            )
+            self._size += size - (previous[0] if previous else 0)
+            self._pending_access.pop(key, None)
+            self._flush_access(commit=False)
+            self._evict()
+            self._connection.commit()
+            self._remember(key, value, now)
+
+    def _touch(self, key: str, now: float) -> None:
+        """ Record access time of entry, written later in batch. Caller must hold the lock. """
+        self._pending_access[key] = now
+        if len(self._pending_access) >= self.ACCESS_FLUSH_ITEMS:
+            self._flush_access()
+
+    def _flush_access(self, commit: bool = True) -> None:
+        """ Write pending access times with one statement. Caller must hold the lock. """
+        if not self._pending_access:
+            return
+        self._connection.executemany(
+            "UPDATE entries SET accessed = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._pending_access.items()]
+        )
+        self._pending_access.clear()
+        if commit:
+            self._connection.commit()
+
+    def flush(self) -> None:
+        """ Write pending access times now. """
+        with self._lock:
+            self._flush_access()
+
+    def _remember(self, key: str, value: Any, created: float) -> None:
+        """ Put entry into in-memory LRU. Caller must hold the lock. """
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        """ Remove entry. Caller must hold the lock. """
+        row = self._connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._connection.commit()
+            self._size -= row[0]
+        self._memory.pop(key, None)
+        self._pending_access.pop(key, None)
+
+    def _evict(self) -> None:
+        """ Remove least recently used entries until size fits the limit. Caller must hold the lock. """
+        while self._size > self.max_size_bytes:
+            rows = self._connection.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                self._pending_access.pop(key, None)
+                self._size -= size
+                self._evictions += 1
+                if self._size <= self.max_size_bytes:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache statistics.
+
+        Returns:
+            Dict : hits, memory_hits, misses, hit_rate, evictions, entries, size_bytes
+        """
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "memory_hits": self._memory_hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": entries,
+                "size_bytes": self._size,
+            }
+
+    def clear(self) -> None:
+        """ Remove all entries. """
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.commit()
+            self._memory.clear()
+            self._pending_access.clear()
+            self._size = 0
+        logging.info(f"Response cache cleared: {self.path}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._connection.close()
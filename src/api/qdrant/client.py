@@ -1,9 +1,11 @@
 import os
 from qdrant_client import QdrantClient as BaseQdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import Distance, VectorParams, PointStruct, SearchRequest, Filter, PayloadSchemaType
 from qdrant_client.http.models import UpdateStatus
 from dotenv import load_dotenv
-from typing import List, Dict, Optional, Union
+from typing import Callable, Iterable, List, Dict, Optional, Union
+from src.api.qdrant.upsert_pipeline import UpsertReport, stream_upsert
+from src.api.qdrant.filters import FilterSpec, build_filter, keyword_score, keyword_variants, payload_schema, reciprocal_rank_fusion
 
 class QdrantClient:
     def __init__(self):
@@ -11,6 +13,7 @@ class QdrantClient:
         self.url = self._get_full_url()
         self._api_key = self._get_env_var("QDRANT_API_KEY")
         self.client = self._initialize_client()
+        self._indexed_fields = set()
         
     def show_url(self):
         return self.url
@@ -171,13 +174,89 @@ class QdrantClient:
         except Exception as e:
             raise Exception(f"Failed to upsert points: {str(e)}")
         
+    def upsert_points_streaming(
+            self,
+            collection_name: str,
+            points: Iterable[PointStruct],
+            batch_size: int = 64,
+            max_workers: int = 4,
+            wait: bool = True,
+            progress_callback: Optional[Callable[[UpsertReport], None]] = None
+    ) -> UpsertReport:
+        """
+        Insert or update points from any iterable (e.g. generator) in fixed-size batches sent in parallel.
+
+        Parameters:
+            collection_name (str) : Name of collection
+            points (Iterable[PointStruct]) : Points containing id, vector and payload - consumed lazily
+            batch_size (int) : Number of points per request
+            max_workers (int) : Number of batches uploaded at the same time
+            wait (bool) : If False, Qdrant acknowledges batch before it is indexed - faster bulk loads
+            progress_callback (Callable, Optional) : Called with UpsertReport after every finished batch
+
+        Returns:
+            UpsertReport : Sent batches and points, failed batches with point ids and error messages
+
+        Example:
+        report = qdrant_client.upsert_points_streaming("s03e02", point_builder.iter_points_from_dict(path))
+        """
+        return stream_upsert(
+            lambda batch: self.client.upsert(collection_name=collection_name, points=batch, wait=wait),
+            points,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            progress_callback=progress_callback
+        )
+        
     
+    def create_payload_index(
+            self,
+            collection_name: str,
+            field_name: str,
+            field_schema: PayloadSchemaType = PayloadSchemaType.KEYWORD
+    ) -> bool:
+        """
+        Create payload index on a field, so filtered searches do not scan every point.
+        Index is created once per client - next calls for the same field do nothing.
+
+        Parameters:
+            collection_name (str) : Name of collection
+            field_name (str) : Payload field, e.g. 'keywords', 'filename' or 'category'
+            field_schema (PayloadSchemaType) : Type of indexed values - KEYWORD for strings and lists of strings
+
+        Returns:
+            bool : True if index was created by this call
+        """
+        if (collection_name, field_name) in self._indexed_fields:
+            return False
+        try:
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+            self._indexed_fields.add((collection_name, field_name))
+            return True
+        except Exception as e:
+            raise Exception(f"Failed to create payload index: {str(e)}")
+
+    def _prepare_filter(self, collection_name: str, filters: Optional[FilterSpec]) -> Optional[Filter]:
+        """ Build Filter and make sure fields used in dictionary filters are indexed. """
+        if isinstance(filters, dict):
+            for field_name, value in filters.items():
+                schema = payload_schema(value)
+                if schema is not None:
+                    self.create_payload_index(collection_name, field_name, schema)
+        return build_filter(filters)
+
     def search_points(
             self,
             collection_name: str, 
             query_vector: List[float],
             limit: int = 5,
-            score_threshold: Optional[float] = None
+            score_threshold: Optional[float] = None,
+            filters: Optional[FilterSpec] = None,
+            with_payload: Union[bool, List[str]] = True
     ) -> List[Dict]:
         """
         Search for nearesr vectors in the collection.
@@ -187,13 +266,20 @@ class QdrantClient:
             query_vector (List[float]) : Embedding representation of Query
             limit (int) : Limit of returned points
             score_threshold (Optional[float]) : Similarity threshold above which results are returned
+            filters (Optional[Dict or Filter]) : Payload conditions, e.g. {"category": "text", "keywords": ["Barbara"]} - filtered on the server
+            with_payload (bool or List[str]) : Return whole payload, no payload or only listed fields
+
+        Returns:
+            List[Dict] : Points as {'id', 'score', 'payload'}, best match first
         """
         try:
             results = self.client.search(
                 collection_name=collection_name,
                 query_vector=query_vector,
+                query_filter=self._prepare_filter(collection_name, filters),
                 limit=limit,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                with_payload=with_payload
             )
             return [
                 {
@@ -204,6 +290,133 @@ class QdrantClient:
             ]
         except Exception as e:
             raise Exception(f"Search failed: {str(e)}")
+
+    def hybrid_search(
+            self,
+            collection_name: str,
+            query_vector: List[float],
+            keywords: List[str],
+            limit: int = 5,
+            filters: Optional[Dict] = None,
+            keyword_field: str = "keywords",
+            candidates: int = 50,
+            rrf_k: int = 60
+    ) -> List[Dict]:
+        """
+        Search combining dense vector similarity with sparse keyword overlap, merged with reciprocal rank fusion.
+
+        Dense ranking comes from vector search, sparse ranking from points whose keyword_field contains
+        any of the query keywords (found with indexed filter, scored by number of matching keywords).
+
+        Parameters:
+            collection_name (str) : Name of collection
+            query_vector (List[float]) : Embedding representation of Query
+            keywords (List[str]) : Keywords of the query
+            limit (int) : Limit of returned points
+            filters (Optional[Dict]) : Payload conditions applied to both rankings
+            keyword_field (str) : Payload field with list of keywords
+            candidates (int) : Number of points taken from each ranking before fusion
+            rrf_k (int) : Reciprocal rank fusion constant
+
+        Returns:
+            List[Dict] : Points as {'id', 'score', 'dense_score', 'keyword_score', 'payload'}, score is the fused RRF score
+        """
+        try:
+            dense = self.search_points(collection_name, query_vector, limit=candidates, filters=filters)
+
+            sparse = []
+            query_keywords = keyword_variants(keywords)
+            if query_keywords:
+                keyword_filter = dict(filters or {})
+                keyword_filter[keyword_field] = query_keywords
+                scroll_filter = self._prepare_filter(collection_name, keyword_filter)
+                offset, max_points = None, candidates * 20
+                # Only keywords are fetched here - full payload is retrieved later for fused results
+                while len(sparse) < max_points:
+                    points, offset = self.client.scroll(
+                        collection_name=collection_name,
+                        scroll_filter=scroll_filter,
+                        limit=min(256, max_points - len(sparse)),
+                        offset=offset,
+                        with_payload=[keyword_field],
+                        with_vectors=False
+                    )
+                    sparse.extend(
+                        {"id": point.id, "score": keyword_score(point.payload.get(keyword_field), keywords)}
+                        for point in points
+                    )
+                    if offset is None:
+                        break
+                sparse.sort(key=lambda point: point["score"], reverse=True)
+                sparse = sparse[:candidates]
+
+            dense_by_id = {point["id"]: point for point in dense}
+            sparse_by_id = {point["id"]: point for point in sparse}
+            fused = reciprocal_rank_fusion([list(dense_by_id), list(sparse_by_id)], k=rrf_k)[:limit]
+
+            missing = [point_id for point_id, _ in fused if point_id not in dense_by_id]
+            payloads = {point["id"]: point["payload"] for point in dense}
+            if missing:
+                for point in self.client.retrieve(collection_name=collection_name, ids=missing, with_payload=True):
+                    payloads[point.id] = point.payload
+            return [
+                {
+                    "id": point_id,
+                    "score": score,
+                    "dense_score": dense_by_id[point_id]["score"] if point_id in dense_by_id else None,
+                    "keyword_score": sparse_by_id[point_id]["score"] if point_id in sparse_by_id else 0,
+                    "payload": payloads.get(point_id)
+                } for point_id, score in fused
+            ]
+        except Exception as e:
+            raise Exception(f"Hybrid search failed: {str(e)}")
+        
+    def search_points_batch(
+            self,
+            collection_name: str,
+            query_vectors: List[List[float]],
+            limit: int = 5,
+            filters: Optional[FilterSpec] = None,
+            score_threshold: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Search for nearest vectors of many queries with one request to Qdrant batch search endpoint.
+
+        Parameters:
+            collection_name (str) : Name of collection
+            query_vectors (List[List[float]]) : Embedding representations of queries (list or 2D numpy array)
+            limit (int) : Limit of returned points per query
+            filters (Optional[Dict or Filter]) : Payload conditions applied to every query
+            score_threshold (Optional[float]) : Similarity threshold above which results are returned
+
+        Returns:
+            List[List[Dict]] : Results for each query, in the order of query_vectors
+        """
+        try:
+            query_filter = self._prepare_filter(collection_name, filters)
+            requests = [
+                SearchRequest(
+                    vector=[float(value) for value in query_vector],
+                    limit=limit,
+                    filter=query_filter,
+                    score_threshold=score_threshold,
+                    with_payload=True
+                ) for query_vector in query_vectors
+            ]
+            if not requests:
+                return []
+            batch_results = self.client.search_batch(collection_name=collection_name, requests=requests)
+            return [
+                [
+                    {
+                        "id": point.id,
+                        "score": point.score,
+                        "payload": point.payload
+                    } for point in results
+                ] for results in batch_results
+            ]
+        except Exception as e:
+            raise Exception(f"Batch search failed: {str(e)}")
         
     
     def delete_points(self, collection_name: str, points_ids: List[Union[str, int]]) -> UpdateStatus:
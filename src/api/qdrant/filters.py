@@ -0,0 +1,130 @@
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue, PayloadSchemaType, Range
+
+RANGE_KEYS = {"gt", "gte", "lt", "lte"}
+
+# Filters can be given as Qdrant Filter or as a simple dictionary:
+# {"category": "text", "keywords": ["Barbara", "Zygfryd"], "year": {"gte": 2020}}
+# - single value must match exactly, list matches any of the values, dict with gt/gte/lt/lte is a range.
+# All conditions must be met.
+FilterSpec = Union[Filter, Dict[str, Any]]
+
+
+def build_filter(conditions: Optional[FilterSpec]) -> Optional[Filter]:
+    """
+    Build Qdrant Filter from dictionary of payload conditions.
+
+    Parameters:
+        conditions (Dict or Filter, Optional) : Conditions as described for FilterSpec, Filter is returned unchanged
+
+    Returns:
+        Optional[Filter] : Filter with all conditions in 'must', None if there are no conditions
+    """
+    if conditions is None or isinstance(conditions, Filter):
+        return conditions
+    must = []
+    for key, value in conditions.items():
+        if isinstance(value, dict):
+            unknown = set(value) - RANGE_KEYS
+            if unknown:
+                raise ValueError(f"Unsupported range operators for field {key}: {sorted(unknown)}")
+            must.append(FieldCondition(key=key, range=Range(**value)))
+        elif isinstance(value, (list, tuple, set)):
+            must.append(FieldCondition(key=key, match=MatchAny(any=list(value))))
+        else:
+            must.append(FieldCondition(key=key, match=MatchValue(value=value)))
+    return Filter(must=must) if must else None
+
+
+def payload_schema(value: Any) -> Optional[PayloadSchemaType]:
+    """ Return payload index type suitable for filter value, None if field should not be indexed. """
+    if isinstance(value, dict):
+        return PayloadSchemaType.FLOAT
+    if isinstance(value, (list, tuple, set)):
+        value = next(iter(value), None)
+    if isinstance(value, bool):
+        return PayloadSchemaType.BOOL
+    if isinstance(value, int):
+        return PayloadSchemaType.INTEGER
+    if isinstance(value, float):
+        return PayloadSchemaType.FLOAT
+    if isinstance(value, str):
+        return PayloadSchemaType.KEYWORD
+    return None
+
+
+def _match_value(field_value: Any, value: Any) -> bool:
+    # Like in Qdrant, condition on array field is met when any element matches
+    if isinstance(field_value, list):
+        return any(_match_value(item, value) for item in field_value)
+    if isinstance(value, dict):
+        if not isinstance(field_value, (int, float)) or isinstance(field_value, bool):
+            return False
+        return all([
+            "gt" not in value or field_value > value["gt"],
+            "gte" not in value or field_value >= value["gte"],
+            "lt" not in value or field_value < value["lt"],
+            "lte" not in value or field_value <= value["lte"],
+        ])
+    if isinstance(value, (list, tuple, set)):
+        return field_value in value
+    return field_value == value
+
+
+def matches_filter(payload: Optional[Dict], conditions: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check in Python if payload meets dictionary conditions - used by LocalQdrantClient.
+
+    Parameters:
+        payload (Dict, Optional) : Point payload
+        conditions (Dict, Optional) : Conditions as described for FilterSpec
+
+    Returns:
+        bool : True if all conditions are met
+    """
+    if not conditions:
+        return True
+    if isinstance(conditions, Filter):
+        raise TypeError("Only dictionary filters can be evaluated locally")
+    payload = payload or {}
+    return all(key in payload and _match_value(payload[key], value) for key, value in conditions.items())
+
+
+def keyword_variants(keywords: Iterable[str]) -> List[str]:
+    """
+    Spellings of keywords used for exact keyword matching in Qdrant, which is case-sensitive:
+    as given, lowercase, capitalized and uppercase.
+    """
+    variants = []
+    for keyword in keywords:
+        for variant in (keyword, keyword.lower(), keyword.capitalize(), keyword.upper()):
+            if variant not in variants:
+                variants.append(variant)
+    return variants
+
+
+def keyword_score(payload_keywords: Optional[Iterable[str]], query_keywords: Iterable[str]) -> int:
+    """ Sparse score of point - number of query keywords present in its keywords (case-insensitive). """
+    if not payload_keywords:
+        return 0
+    point_keywords = {keyword.casefold() for keyword in payload_keywords}
+    return sum(1 for keyword in {keyword.casefold() for keyword in query_keywords} if keyword in point_keywords)
+
+
+def reciprocal_rank_fusion(rankings: List[List[Union[str, int]]], k: int = 60) -> List[tuple]:
+    """
+    Merge rankings with reciprocal rank fusion: score(id) = sum over rankings of 1 / (k + rank).
+
+    Parameters:
+        rankings (List[List]) : Lists of point ids, best first
+        k (int) : Smoothing constant, higher value gives less weight to top ranks
+
+    Returns:
+        List[tuple] : (point id, fused score) sorted by score, best first
+    """
+    scores: Dict[Union[str, int], float] = {}
+    for ranking in rankings:
+        for rank, point_id in enumerate(ranking, start=1):
+            scores[point_id] = scores.get(point_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
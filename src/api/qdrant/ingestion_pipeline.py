@@ -0,0 +1,275 @@
+import queue
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from qdrant_client.models import PointStruct
+
+# End of stream marker passed between stages
+_DONE = object()
+
+
+@dataclass
+class IngestedFile:
+    """ Outcome of one file - point if it was processed, otherwise the failed stage and error. """
+    index: int
+    file_path: str
+    text: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    embedding: Optional[List[float]] = None
+    point: Optional[PointStruct] = None
+    stage: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class IngestionResult:
+    """ Result of ingestion - points in input file order and errors of files which failed. """
+    points: List[PointStruct] = field(default_factory=list)
+    errors: List[Dict] = field(default_factory=list)  # {"file_path", "stage", "error"}
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+
+class IngestionPipeline:
+    """
+    Staged, concurrent ingestion of text files into Qdrant points.
+
+    Stages: read -> keywords -> embeddings (batched) -> assembly. Each stage has its own
+    worker threads and stages are connected with bounded queues, so slow network stages
+    (LLM keyword calls, embedding requests) overlap and memory use stays flat.
+    Results are returned in input order. A file failing in any stage skips the following
+    stages and is reported with the stage name and error.
+
+    Usage example:
+    pipeline = IngestionPipeline(
+        read_file=file_handler.load_txt,
+        extract_keywords=lambda path, text: keywords_generator.generate_keywords_from_text(text, path),
+        embed_texts=point_builder.embed_texts,
+        build_point=point_builder.single_point_struct
+    )
+    result = pipeline.run(file_paths)
+    """
+
+    def __init__(
+            self,
+            read_file: Callable[[str], str],
+            extract_keywords: Callable[[str, str], List[str]],
+            embed_texts: Callable[[List[str]], object],
+            build_point: Callable[..., PointStruct],
+            point_id: Optional[Callable[[str], str]] = None,
+            reader_workers: int = 4,
+            keyword_workers: int = 8,
+            embedding_workers: int = 2,
+            assembly_workers: int = 1,
+            embedding_batch_size: int = 32,
+            queue_size: int = 64
+    ):
+        """
+        Parameters:
+            read_file (Callable) : Returns text of file for path
+            extract_keywords (Callable) : Returns keywords for (file_path, text)
+            embed_texts (Callable) : Returns embeddings (list or matrix rows) for list of texts - an Exception
+                                     in place of embedding fails only that file
+            build_point (Callable) : Builds point from filename, text, keywords and embedding keyword arguments
+            point_id (Callable, Optional) : Returns point id for file path, passed to build_point as point_id
+            reader_workers, keyword_workers, embedding_workers, assembly_workers (int) : Threads per stage
+            embedding_batch_size (int) : Maximum number of texts sent in one embedding request
+            queue_size (int) : Capacity of each queue between stages
+        """
+        self.read_file = read_file
+        self.extract_keywords = extract_keywords
+        self.embed_texts = embed_texts
+        self.build_point = build_point
+        self.point_id = point_id
+        self.reader_workers = max(1, reader_workers)
+        self.keyword_workers = max(1, keyword_workers)
+        self.embedding_workers = max(1, embedding_workers)
+        self.assembly_workers = max(1, assembly_workers)
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.queue_size = queue_size
+
+    def _read(self, item: IngestedFile) -> None:
+        item.text = self.read_file(item.file_path)
+
+    def _keywords(self, item: IngestedFile) -> None:
+        item.keywords = list(self.extract_keywords(item.file_path, item.text))
+        logging.info(f"Generated {len(item.keywords)} keywords for {Path(item.file_path).name}")
+
+    def _assemble(self, item: IngestedFile) -> None:
+        point_options = {"point_id": self.point_id(item.file_path)} if self.point_id is not None else {}
+        item.point = self.build_point(
+            filename=str(Path(item.file_path).name),
+            text=item.text,
+            keywords=item.keywords,
+            embedding=item.embedding,
+            **point_options
+        )
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        """ Put item into bounded queue, give up when pipeline is stopped. """
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop: threading.Event, timeout: Optional[float] = None):
+        """ Get item from queue, _DONE when pipeline is stopped, None if timeout passed. """
+        waited = 0.0
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                waited += 0.1
+                if timeout is not None and waited >= timeout:
+                    return None
+        return _DONE
+
+    @staticmethod
+    def _fail(item: IngestedFile, stage: str, error: Exception) -> None:
+        item.stage = stage
+        item.error = str(error)
+        logging.error(f"Error processing {item.file_path} in stage {stage}: {str(error)}")
+
+    def _stage_finished(self, state: Dict, outbox: queue.Queue, stop: threading.Event) -> None:
+        """ Pass end of stream to next stage once the last worker of a stage is done. """
+        with state["lock"]:
+            state["running"] -= 1
+            last = state["running"] == 0
+        if last:
+            self._put(outbox, _DONE, stop)
+
+    def _item_worker(self, name: str, func: Callable, inbox: queue.Queue, outbox: queue.Queue, state: Dict, stop: threading.Event) -> None:
+        while True:
+            item = self._get(inbox, stop)
+            if item is _DONE:
+                # Leave end marker for remaining workers of this stage
+                self._put(inbox, _DONE, stop)
+                break
+            if item.error is None:
+                try:
+                    func(item)
+                except Exception as e:
+                    self._fail(item, name, e)
+            if not self._put(outbox, item, stop):
+                return
+        self._stage_finished(state, outbox, stop)
+
+    def _embedding_worker(self, inbox: queue.Queue, outbox: queue.Queue, state: Dict, stop: threading.Event) -> None:
+        finished = False
+        while not finished:
+            item = self._get(inbox, stop)
+            if item is _DONE:
+                self._put(inbox, _DONE, stop)
+                break
+            batch = [item]
+            # Fill the batch with items which are already waiting, do not hold the first one for long
+            while len(batch) < self.embedding_batch_size:
+                item = self._get(inbox, stop, timeout=0.05)
+                if item is None:
+                    break
+                if item is _DONE:
+                    self._put(inbox, _DONE, stop)
+                    finished = True
+                    break
+                batch.append(item)
+
+            pending = [item for item in batch if item.error is None]
+            if pending:
+                try:
+                    embeddings = self.embed_texts([item.text for item in pending])
+                    for item, embedding in zip(pending, embeddings):
+                        if isinstance(embedding, Exception):
+                            self._fail(item, "embeddings", embedding)
+                            continue
+                        item.embedding = [float(value) for value in embedding]
+                    logging.info(f"Generated embeddings for batch of {len(pending)} files")
+                except Exception as e:
+                    for item in pending:
+                        self._fail(item, "embeddings", e)
+            for item in batch:
+                if not self._put(outbox, item, stop):
+                    return
+        self._stage_finished(state, outbox, stop)
+
+    def stream(self, file_paths: List[str]) -> Iterator[IngestedFile]:
+        """
+        Process files and yield their outcomes in input order, as soon as they are ready.
+
+        Parameters:
+            file_paths (List[str]) : Paths of text files
+
+        Yields:
+            IngestedFile : Outcome of each file, with point or stage and error
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(5)]
+        stages = [
+            (lambda inbox, outbox, state: self._item_worker("read", self._read, inbox, outbox, state, stop), self.reader_workers),
+            (lambda inbox, outbox, state: self._item_worker("keywords", self._keywords, inbox, outbox, state, stop), self.keyword_workers),
+            (lambda inbox, outbox, state: self._embedding_worker(inbox, outbox, state, stop), self.embedding_workers),
+            (lambda inbox, outbox, state: self._item_worker("assembly", self._assemble, inbox, outbox, state, stop), self.assembly_workers),
+        ]
+
+        def feed() -> None:
+            for index, file_path in enumerate(file_paths):
+                if not self._put(queues[0], IngestedFile(index=index, file_path=file_path), stop):
+                    return
+            self._put(queues[0], _DONE, stop)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for position, (worker, count) in enumerate(stages):
+            state = {"lock": threading.Lock(), "running": count}
+            for _ in range(count):
+                threads.append(threading.Thread(
+                    target=worker, args=(queues[position], queues[position + 1], state), daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+
+        try:
+            ready: Dict[int, IngestedFile] = {}
+            next_index = 0
+            while next_index < len(file_paths):
+                item = self._get(queues[-1], stop)
+                if item is _DONE:
+                    break
+                ready[item.index] = item
+                while next_index in ready:
+                    yield ready.pop(next_index)
+                    next_index += 1
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def run(self, file_paths: List[str]) -> IngestionResult:
+        """
+        Process all files.
+
+        Parameters:
+            file_paths (List[str]) : Paths of text files
+
+        Returns:
+            IngestionResult : Points in input order and per-file errors
+        """
+        result = IngestionResult()
+        for item in self.stream(file_paths):
+            if item.error is None:
+                result.points.append(item.point)
+            else:
+                result.errors.append({"file_path": item.file_path, "stage": item.stage, "error": item.error})
+        logging.info(f"Ingestion finished: {len(result.points)} points, {len(result.errors)} failed files")
+        return result
@@ -0,0 +1,409 @@
+import logging
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from qdrant_client.models import Distance, PointStruct
+from qdrant_client.http.models import UpdateStatus
+
+from src.api.qdrant.filters import keyword_score, matches_filter, reciprocal_rank_fusion
+from src.api.qdrant.upsert_pipeline import UpsertReport, stream_upsert
+
+
+class LocalCollection:
+    """
+    In-memory vector collection with brute-force exact search and optional IVF index.
+
+    Vectors live in one growable float32 matrix. For COSINE distance they are normalized
+    on insert, so search is a single matrix-vector product. In IVF mode vectors are
+    clustered with k-means into n_lists cells and search scans only n_probe nearest cells.
+    """
+
+    def __init__(
+            self,
+            vector_size: int,
+            distance: Distance = Distance.COSINE,
+            index_type: str = "flat",
+            n_lists: int = 0,
+            n_probe: int = 8,
+            ivf_min_points: int = 10_000
+    ):
+        """
+        Parameters:
+            vector_size (int) : Dimension of vectors
+            distance (Distance) : COSINE, DOT or EUCLID
+            index_type (str) : 'flat' for exact search, 'ivf' for approximate search on large collections
+            n_lists (int) : Number of IVF cells, 0 means about sqrt(number of points)
+            n_probe (int) : Number of IVF cells scanned per query
+            ivf_min_points (int) : Below this size IVF collection is searched exactly
+        """
+        if distance not in (Distance.COSINE, Distance.DOT, Distance.EUCLID):
+            raise ValueError(f"Unsupported distance for local collection: {distance}")
+        if index_type not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index type: {index_type}")
+        self.vector_size = vector_size
+        self.distance = distance
+        self.index_type = index_type
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.ivf_min_points = ivf_min_points
+
+        self._vectors = np.empty((64, vector_size), dtype=np.float32)
+        self._sq_norms = np.empty(64, dtype=np.float32)
+        self._ids: List[Union[str, int]] = []
+        self._payloads: List[Optional[Dict]] = []
+        self._rows: Dict[Union[str, int], int] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(64, dtype=np.int32)
+        self._trained_size = 0
+        # Rows grouped by IVF cell (rows sorted by cell + start offset of every cell), rebuilt lazily after changes
+        self._cell_order: Optional[np.ndarray] = None
+        self._cell_offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[-1] != self.vector_size:
+            raise ValueError(f"Vector size {vectors.shape[-1]} does not match collection size {self.vector_size}")
+        if self.distance == Distance.COSINE:
+            norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        return vectors
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_vectors", "_sq_norms", "_assignments"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(self)] = old[:len(self)]
+            setattr(self, name, new)
+
+    def upsert(self, points: List[PointStruct]) -> None:
+        """ Insert new points or replace vector and payload of existing ones. """
+        if not points:
+            return
+        vectors = self._prepare([point.vector for point in points])
+        self._grow(len(self) + len(points))
+        self._cell_order = None
+        for point, vector in zip(points, vectors):
+            row = self._rows.get(point.id)
+            if row is None:
+                row = len(self._ids)
+                self._rows[point.id] = row
+                self._ids.append(point.id)
+                self._payloads.append(point.payload)
+            else:
+                self._payloads[row] = point.payload
+            self._vectors[row] = vector
+            self._sq_norms[row] = float(vector @ vector)
+            if self._centroids is not None:
+                self._assignments[row] = self._nearest_centroids(vector[None, :], 1)[0, 0]
+
+    def delete(self, point_ids: List[Union[str, int]]) -> None:
+        """ Remove points, moving the last row into each freed slot. """
+        self._cell_order = None
+        for point_id in point_ids:
+            row = self._rows.pop(point_id, None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._ids[row] = moved_id
+                self._payloads[row] = self._payloads[last]
+                self._vectors[row] = self._vectors[last]
+                self._sq_norms[row] = self._sq_norms[last]
+                self._assignments[row] = self._assignments[last]
+                self._rows[moved_id] = row
+            self._ids.pop()
+            self._payloads.pop()
+
+    def _nearest_centroids(self, vectors: np.ndarray, count: int) -> np.ndarray:
+        """ Indices of `count` nearest centroids (L2) for every vector. """
+        distances = (
+            np.einsum("ij,ij->i", vectors, vectors)[:, None]
+            - 2 * vectors @ self._centroids.T
+            + np.einsum("ij,ij->i", self._centroids, self._centroids)[None, :]
+        )
+        count = min(count, self._centroids.shape[0])
+        nearest = np.argpartition(distances, count - 1, axis=1)[:, :count]
+        return nearest
+
+    def _train_ivf(self, iterations: int = 10, seed: int = 0) -> None:
+        """ Cluster current vectors with k-means (trained on a sample for large collections). """
+        size = len(self)
+        n_lists = min(self.n_lists or max(1, int(np.sqrt(size))), size)
+        rng = np.random.default_rng(seed)
+        data = self._vectors[:size]
+        sample = data[rng.choice(size, size=min(size, n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            self._centroids = centroids
+            labels = self._nearest_centroids(sample, 1)[:, 0]
+            for cell in range(n_lists):
+                members = sample[labels == cell]
+                if len(members):
+                    centroids[cell] = members.mean(axis=0)
+        self._centroids = centroids
+        for start in range(0, size, 65_536):
+            chunk = data[start:start + 65_536]
+            self._assignments[start:start + len(chunk)] = self._nearest_centroids(chunk, 1)[:, 0]
+        self._trained_size = size
+        self._cell_order = None
+        logging.info(f"Trained IVF index with {n_lists} cells on {size} points")
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """ Rows to scan for query, None means whole collection. """
+        if self.index_type != "ivf" or len(self) < self.ivf_min_points:
+            return None
+        # Retrain when collection doubled since last training - cells of new points get too crowded
+        if self._centroids is None or len(self) >= 2 * self._trained_size:
+            self._train_ivf()
+        if self._cell_order is None:
+            assignments = self._assignments[:len(self)]
+            self._cell_order = np.argsort(assignments, kind="stable")
+            self._cell_offsets = np.searchsorted(assignments[self._cell_order], np.arange(self._centroids.shape[0] + 1))
+        cells = self._nearest_centroids(query[None, :], self.n_probe)[0]
+        return np.concatenate([self._cell_order[self._cell_offsets[cell]:self._cell_offsets[cell + 1]] for cell in cells])
+
+    def filter_rows(self, filters: Optional[Dict]) -> Optional[np.ndarray]:
+        """ Rows whose payload meets dictionary filters, None means all rows. """
+        if not filters:
+            return None
+        return np.array([row for row in range(len(self)) if matches_filter(self._payloads[row], filters)], dtype=np.int64)
+
+    def iter_points(self, filters: Optional[Dict] = None) -> Iterator[Tuple[Union[str, int], Dict]]:
+        """ Yield (id, payload) of points meeting dictionary filters, missing payload as empty dict. """
+        rows = self.filter_rows(filters)
+        for row in (range(len(self)) if rows is None else rows):
+            yield self._ids[row], self._payloads[row] or {}
+
+    def search(
+            self,
+            query_vector: List[float],
+            limit: int = 5,
+            score_threshold: Optional[float] = None,
+            filters: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Return up to `limit` nearest points as {'id', 'score', 'payload'} dictionaries, best first.
+        For EUCLID score is the distance (lower is better), as in Qdrant.
+        With filters only points whose payload meets the conditions are scored.
+        """
+        if len(self) == 0 or limit <= 0:
+            return []
+        query = self._prepare(query_vector)
+        rows = self._candidate_rows(query)
+        allowed = self.filter_rows(filters)
+        if allowed is not None:
+            rows = allowed if rows is None else np.intersect1d(rows, allowed, assume_unique=True)
+        if rows is not None and len(rows) == 0:
+            return []
+        vectors = self._vectors[:len(self)] if rows is None else self._vectors[rows]
+
+        scores = vectors @ query
+        if self.distance == Distance.EUCLID:
+            sq_norms = self._sq_norms[:len(self)] if rows is None else self._sq_norms[rows]
+            scores = np.sqrt(np.maximum(sq_norms - 2 * scores + float(query @ query), 0))
+            order_scores = -scores
+        else:
+            order_scores = scores
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-order_scores, limit - 1)[:limit]
+        top = top[np.argsort(-order_scores[top])]
+
+        results = []
+        for index in top:
+            score = float(scores[index])
+            if score_threshold is not None:
+                if self.distance == Distance.EUCLID and score > score_threshold:
+                    break
+                if self.distance != Distance.EUCLID and score < score_threshold:
+                    break
+            row = int(index) if rows is None else int(rows[index])
+            results.append({"id": self._ids[row], "score": score, "payload": self._payloads[row]})
+        return results
+
+
+class LocalQdrantClient:
+    """
+    In-process drop-in replacement of QdrantClient for offline jobs and tests.
+
+    Exposes the same methods and signatures as src.api.qdrant.client.QdrantClient,
+    but keeps collections in memory (LocalCollection) - no Qdrant server is needed.
+
+    Usage example:
+    qdrant_client = LocalQdrantClient()            # instead of QdrantClient()
+    qdrant_client.create_collections("s03e02", 1536)
+    qdrant_client.upsert_points("s03e02", points)
+    answer = qdrant_client.search_points("s03e02", query_vector, limit=1)
+    """
+
+    def __init__(self, index_type: str = "flat", n_lists: int = 0, n_probe: int = 8, ivf_min_points: int = 10_000):
+        """
+        Parameters:
+            index_type (str) : 'flat' (exact) or 'ivf' (approximate) - used for every new collection
+            n_lists (int) : Number of IVF cells, 0 means about sqrt(number of points)
+            n_probe (int) : Number of IVF cells scanned per query
+            ivf_min_points (int) : Below this size IVF collections are searched exactly
+        """
+        self.index_options = {
+            "index_type": index_type,
+            "n_lists": n_lists,
+            "n_probe": n_probe,
+            "ivf_min_points": ivf_min_points
+        }
+        self.collections: Dict[str, LocalCollection] = {}
+
+    def _get(self, collection_name: str) -> LocalCollection:
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            raise Exception(f"Collection {collection_name} not found")
+        return collection
+
+    def list_collections(self) -> List[str]:
+        """ Get a list of all existing collections. """
+        return list(self.collections)
+
+    def create_collections(self, collection_name: str, vector_size: int, distance: Distance = Distance.COSINE) -> bool:
+        """
+        Create new collection with given name.
+
+        Parameters:
+            collection_name (str) : Name of creating collection
+            vector_size (int) : Size of vector dimensions depending of embedding model
+            distance (Distance) : COSINE, DOT or EUCLID
+
+        Returns:
+            bool : True if collection is successfully created
+        """
+        if collection_name in self.collections:
+            raise Exception(f"Failed to create collectoin: collection {collection_name} already exists")
+        self.collections[collection_name] = LocalCollection(vector_size, distance, **self.index_options)
+        return True
+
+    def collection_exists(self, collection_name: str) -> bool:
+        """ Check if collection exists. """
+        return collection_name in self.collections
+
+    def get_collection(self, collection_name: str) -> Dict:
+        """ Get information about a specific collection. """
+        collection = self._get(collection_name)
+        return {
+            "vectors_count": len(collection),
+            "points_count": len(collection),
+            "vector_size": collection.vector_size,
+            "distance": collection.distance,
+            "status": "green"
+        }
+
+    def upsert_points(self, collection_name: str, points: List[PointStruct]) -> UpdateStatus:
+        """ Insert or update points in the collection. """
+        self._get(collection_name).upsert(points)
+        return UpdateStatus.COMPLETED
+
+    def upsert_points_streaming(
+            self,
+            collection_name: str,
+            points: Iterable[PointStruct],
+            batch_size: int = 64,
+            max_workers: int = 4,
+            wait: bool = True,
+            progress_callback: Optional[Callable[[UpsertReport], None]] = None
+    ) -> UpsertReport:
+        """ Insert or update points from any iterable in fixed-size batches (applied sequentially in memory). """
+        collection = self._get(collection_name)
+        return stream_upsert(collection.upsert, points, batch_size=batch_size, max_workers=1, progress_callback=progress_callback)
+
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema=None) -> bool:
+        """ Payload filters are evaluated in memory - nothing to index, kept for interface compatibility. """
+        self._get(collection_name)
+        return False
+
+    def search_points(
+            self,
+            collection_name: str,
+            query_vector: List[float],
+            limit: int = 5,
+            score_threshold: Optional[float] = None,
+            filters: Optional[Dict] = None,
+            with_payload: Union[bool, List[str]] = True
+    ) -> List[Dict]:
+        """
+        Search for nearest vectors in the collection.
+
+        Returns:
+            List[Dict] : Points as {'id', 'score', 'payload'}, best match first
+        """
+        results = self._get(collection_name).search(query_vector, limit, score_threshold, filters)
+        if with_payload is not True:
+            for point in results:
+                payload = point["payload"] or {}
+                point["payload"] = {key: payload[key] for key in with_payload if key in payload} if with_payload else None
+        return results
+
+    def hybrid_search(
+            self,
+            collection_name: str,
+            query_vector: List[float],
+            keywords: List[str],
+            limit: int = 5,
+            filters: Optional[Dict] = None,
+            keyword_field: str = "keywords",
+            candidates: int = 50,
+            rrf_k: int = 60
+    ) -> List[Dict]:
+        """ Dense + keyword search merged with reciprocal rank fusion, same result format as QdrantClient.hybrid_search. """
+        collection = self._get(collection_name)
+        dense = collection.search(query_vector, candidates, filters=filters)
+
+        sparse = []
+        for point_id, payload in collection.iter_points(filters):
+            score = keyword_score(payload.get(keyword_field), keywords)
+            if score > 0:
+                sparse.append({"id": point_id, "score": score, "payload": payload})
+        sparse.sort(key=lambda point: point["score"], reverse=True)
+        sparse = sparse[:candidates]
+
+        dense_by_id = {point["id"]: point for point in dense}
+        sparse_by_id = {point["id"]: point for point in sparse}
+        fused = reciprocal_rank_fusion([list(dense_by_id), list(sparse_by_id)], k=rrf_k)[:limit]
+        return [
+            {
+                "id": point_id,
+                "score": score,
+                "dense_score": dense_by_id[point_id]["score"] if point_id in dense_by_id else None,
+                "keyword_score": sparse_by_id[point_id]["score"] if point_id in sparse_by_id else 0,
+                "payload": (dense_by_id.get(point_id) or sparse_by_id[point_id])["payload"]
+            } for point_id, score in fused
+        ]
+
+    def search_points_batch(
+            self,
+            collection_name: str,
+            query_vectors: List[List[float]],
+            limit: int = 5,
+            filters=None,
+            score_threshold: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """ Search for nearest vectors of many queries, results in the order of query_vectors. """
+        collection = self._get(collection_name)
+        return [collection.search(query_vector, limit, score_threshold, filters) for query_vector in query_vectors]
+
+    def delete_points(self, collection_name: str, points_ids: List[Union[str, int]]) -> UpdateStatus:
+        """ Delete points from the collection for given ids. """
+        self._get(collection_name).delete(points_ids)
+        return UpdateStatus.COMPLETED
+
+    def delete_collection(self, collection_name: str) -> bool:
+        """ Delete the collection. """
+        self._get(collection_name)
+        del self.collections[collection_name]
+        return True
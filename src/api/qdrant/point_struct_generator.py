@@ -2,7 +2,7 @@ import os
 import sys
 import logging
 
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List
 from pathlib import Path
 
 # Add project root to Python path
@@ -11,7 +11,10 @@ sys.path.append(project_root)
 
 from src.utils.file_handler import FileHandler
 from src.utils.text_processor import TextProcessor
+from src.utils.embedding_store import EmbeddingStore
+from src.utils.ingestion_manifest import IngestionManifest
 from src.api.openai.client import OpenAIClient
+from src.api.qdrant.ingestion_pipeline import IngestionPipeline, IngestionResult
 from src.services.key_words.key_words_extractor import KeyWordsGenerator
 from qdrant_client import models
 import uuid
@@ -33,7 +36,7 @@ class PointStructBuilder:
         """
         return str(uuid.uuid4())
     
-    def single_point_struct(self, filename:str, text:str, keywords: List[str], embedding: List[float]) -> Dict:
+    def single_point_struct(self, filename:str, text:str, keywords: List[str], embedding: List[float], point_id: Optional[str] = None) -> Dict:
         """
         Generate point structure for given data.
 
@@ -42,6 +45,7 @@ class PointStructBuilder:
             text (str) : Text content to be stored
             keywords(List[str]): List of keywords associated with the text
             embedding (List[float]): Vector embedding of the text
+            point_id (Optional[str]): Id of the point, random UUID if not given
 
         Returns:
             model.PointStruct: Qdrant point structure containing the data 
@@ -53,7 +57,7 @@ class PointStructBuilder:
         if not isinstance(embedding, list) or not all(isinstance(e, float) for e in embedding):
             raise TypeError("embedding must be a list of floats")
         point = models.PointStruct(
-            id = self.generate_uuid(),
+            id = point_id or self.generate_uuid(),
             payload = {
                 "filename" : filename,
                 "text": text,
@@ -65,49 +69,165 @@ class PointStructBuilder:
         return point
     
 
-    def get_points_from_dict(self, dict_path: str) -> dict:
-        points = []
+    def embed_texts(self, texts: List[str]) -> list:
+        """
+        Embed texts in batched requests, keeping failures per text.
+
+        Returns:
+            list : Embedding of each text, or exception for texts which could not be embedded
+        """
+        errors = {}
+        matrix = self.client_openai.generate_embeddings(texts, errors=errors)
+        return [RuntimeError(errors[index]) if index in errors else matrix[index] for index in range(len(texts))]
+
+
+    def build_ingestion_pipeline(self, root_path: str, **pipeline_options) -> IngestionPipeline:
+        """
+        Create concurrent ingestion pipeline using this builder's clients.
+        Point ids are deterministic (UUIDv5 of file path relative to root_path, as in IngestionManifest),
+        so re-ingested files overwrite their points wherever the script is run from.
+
+        Parameters:
+            root_path (str) : Directory file paths are made relative to, usually the ingested directory
+            pipeline_options : IngestionPipeline worker counts, embedding_batch_size and queue_size
+
+        Returns:
+            IngestionPipeline : Pipeline producing points with single_point_struct
+        """
+        return IngestionPipeline(
+            read_file=self.file_handler.load_txt,
+            extract_keywords=lambda file_path, text: self.keywords_generator.generate_keywords_from_text(text, file_path),
+            embed_texts=self.embed_texts,
+            build_point=self.single_point_struct,
+            point_id=lambda file_path: IngestionManifest.key_point_id(IngestionManifest.relative_key(file_path, root_path)),
+            **pipeline_options
+        )
+
+
+    def ingest_directory(self, dict_path: str, **pipeline_options) -> IngestionResult:
+        """
+        Generate points for all .txt files in directory with concurrent pipeline.
 
-        # Get all files path from directory
+        Parameters:
+            dict_path (str) : Directory with .txt files
+            pipeline_options : IngestionPipeline options, e.g. keyword_workers=16
+
+        Returns:
+            IngestionResult : Points in file order and errors of files which failed
+        """
+        files = self.file_handler.get_list_file_paths_from_direcotry(dict_path, ['.txt'])
+        logging.info(f"Found {len(files)} files to process.")
+        return self.build_ingestion_pipeline(dict_path, **pipeline_options).run(files)
+
+
+    def get_points_from_dict(self, dict_path: str, **pipeline_options) -> list:
+        result = self.ingest_directory(dict_path, **pipeline_options)
+        for error in result.errors:
+            logging.error(f"Skipped {error['file_path']} - failed in stage {error['stage']}: {error['error']}")
+        return result.points
+
+
+    def iter_points_from_dict(self, dict_path: str, embedding_batch_size: int = 32, **pipeline_options) -> Iterator[models.PointStruct]:
+        """
+        Generate points for all .txt files in directory lazily.
+
+        Files go through the concurrent ingestion pipeline and points are yielded in file order
+        as soon as they are ready, so they can be streamed into a collection
+        (QdrantClient.upsert_points_streaming) without holding all of them.
+        Files which failed are logged and skipped.
+
+        Parameters:
+            dict_path (str) : Directory with .txt files
+            embedding_batch_size (int) : Maximum number of files embedded in one request
+            pipeline_options : Other IngestionPipeline options
+
+        Yields:
+            models.PointStruct : Point for each successfully processed file
+        """
         files = self.file_handler.get_list_file_paths_from_direcotry(dict_path, ['.txt'])
         logging.info(f"Found {len(files)} files to process.")
 
-        for file_path in files:
-            try:
-                logging.info(f"Processing file: {Path(file_path).name}")
-                text_content = self.file_handler.load_txt(file_path)
-
-                # Generate keywords from file content
-                keywords = self.keywords_generator.generate_keywords(file_path)
-                logging.info(f"Generated {len(keywords)} keywords for {Path(file_path).name}")
-
-                # Create Embedding
-                embedding = self.client_openai.generate_embedding(text_content)
-                logging.info(f"Generated embedding, vector size: {len(embedding)}")
-
-                # Create point_structure
-                point = self.single_point_struct(
-                    filename=str(Path(file_path).name),
-                    text=text_content,
-                    keywords=keywords,
-                    embedding=embedding
-                )
-                logging.info(f"Generated point point structure\n{point}")
-
-                points.append(point)
-
-            except Exception as e:
-                logging.error(f"Error processing {file_path}: {str(e)}")
-                point = self.single_point_struct(
-                    filename=str(Path(file_path).name),
-                    text="Error processing file",
-                    keywords=[],
-                    embedding=[0.0]*1536
-                )
-
-        return points
+        pipeline = self.build_ingestion_pipeline(dict_path, embedding_batch_size=embedding_batch_size, **pipeline_options)
+        for item in pipeline.stream(files):
+            if item.error is not None:
+                logging.error(f"Skipped {item.file_path} - failed in stage {item.stage}: {item.error}")
+                continue
+            yield item.point
     
 
+    def sync_directory(
+            self,
+            dict_path: str,
+            qdrant_client,
+            collection_name: str,
+            manifest_path: Optional[str] = None,
+            batch_size: int = 64,
+            **pipeline_options
+    ) -> Dict:
+        """
+        Incrementally synchronize collection with .txt files in directory.
+
+        Only added and changed files go through keywords and embeddings (changed files keep
+        their point id, so their points are overwritten), points of removed files are deleted
+        and unchanged files cost nothing. State is kept in IngestionManifest.
+
+        Parameters:
+            dict_path (str) : Directory with .txt files
+            qdrant_client : QdrantClient or LocalQdrantClient
+            collection_name (str) : Name of existing collection
+            manifest_path (Optional[str]) : Manifest file, by default .ingestion_manifest.json in dict_path
+            batch_size (int) : Number of points per upsert request
+            pipeline_options : IngestionPipeline options
+
+        Returns:
+            Dict : Lists of 'added', 'changed', 'removed' and 'failed' files and number of 'unchanged' ones
+        """
+        # Keys relative to the synchronized directory - the same wherever the script is run from
+        manifest = IngestionManifest(manifest_path or os.path.join(dict_path, ".ingestion_manifest.json"), root=dict_path)
+        files = self.file_handler.get_list_file_paths_from_direcotry(dict_path, ['.txt'])
+        diff = manifest.diff(files)
+
+        processed, failed = [], []
+
+        def points():
+            for item in self.build_ingestion_pipeline(dict_path, **pipeline_options).stream(diff.to_process):
+                if item.error is not None:
+                    logging.error(f"Skipped {item.file_path} - failed in stage {item.stage}: {item.error}")
+                    failed.append({"file_path": item.file_path, "stage": item.stage, "error": item.error})
+                    continue
+                processed.append(item)
+                yield item.point
+
+        report = qdrant_client.upsert_points_streaming(collection_name, points(), batch_size=batch_size)
+        failed_ids = {str(point_id) for batch in report.failed_batches for point_id in batch["point_ids"]}
+        for item in processed:
+            if str(item.point.id) in failed_ids:
+                failed.append({"file_path": item.file_path, "stage": "upsert", "error": "Upsert of batch failed"})
+                continue
+            manifest.record(item.file_path, diff.hashes[item.file_path], keywords=item.keywords)
+
+        removed_ids = [manifest.files[key]["point_id"] for key in diff.removed]
+        if removed_ids:
+            qdrant_client.delete_points(collection_name, removed_ids)
+        for key in diff.removed:
+            manifest.remove(key)
+        manifest.save()
+
+        failed_paths = {error["file_path"] for error in failed}
+        summary = {
+            "added": [path for path in diff.added if path not in failed_paths],
+            "changed": [path for path in diff.changed if path not in failed_paths],
+            "unchanged": len(diff.unchanged),
+            "removed": diff.removed,
+            "failed": failed
+        }
+        logging.info(
+            f"Synchronized {collection_name}: {len(summary['added'])} added, {len(summary['changed'])} changed, "
+            f"{summary['unchanged']} unchanged, {len(summary['removed'])} removed, {len(failed)} failed"
+        )
+        return summary
+
+
     def save_points_as_JSON(self, points: list, dest_path: str, filename: str = "qdrant_test_point.json") -> None:
         """
         Save metadata list of dictionaries as JSON file with given name and under given location.
@@ -133,19 +253,41 @@ class PointStructBuilder:
         self.file_handler.save_json(filename_path, serializable_points)
 
 
+    def save_points_to_store(self, points: list, store_path: str) -> None:
+        """
+        Append points to compact embedding store (float32 matrix + JSONL sidecar) instead of JSON lists.
 
+        Parameters:
+            points (List[PointStruct]) : Points to save
+            store_path (str) : Directory of the embedding store
 
+        Returns:
+            None
+        """
+        if not points:
+            return
+        store = EmbeddingStore(store_path)
+        store.append(
+            ids=[str(point.id) for point in points],
+            vectors=[point.vector for point in points],
+            payloads=[point.payload for point in points]
+        )
 
 
-    
-
-    
-
-
-    
-    
+    @staticmethod
+    def load_points_from_store(store_path: str) -> list:
+        """
+        Load points saved with save_points_to_store.
 
+        Parameters:
+            store_path (str) : Directory of the embedding store
 
-    
-        
+        Returns:
+            List[PointStruct] : Points in the order they were saved
+        """
+        ids, vectors, payloads = EmbeddingStore(store_path).load()
+        return [
+            models.PointStruct(id=point_id, payload=payload, vector=vector.tolist())
+            for point_id, vector, payload in zip(ids, vectors, payloads)
+        ]
 
@@ -0,0 +1,92 @@
+import logging
+from itertools import islice
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from qdrant_client.models import PointStruct
+
+
+@dataclass
+class UpsertReport:
+    """ Result of streaming upsert. """
+    batches_sent: int = 0
+    points_sent: int = 0
+    failed_batches: List[Dict] = field(default_factory=list)  # {"batch_index", "point_ids", "error"}
+
+    @property
+    def points_failed(self) -> int:
+        return sum(len(batch["point_ids"]) for batch in self.failed_batches)
+
+    @property
+    def success(self) -> bool:
+        return not self.failed_batches
+
+
+def iter_batches(points: Iterable[PointStruct], batch_size: int) -> Iterator[List[PointStruct]]:
+    """ Group points from any iterable into lists of batch_size (the last one may be shorter). """
+    iterator = iter(points)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_upsert(
+        upsert_batch: Callable[[List[PointStruct]], Any],
+        points: Iterable[PointStruct],
+        batch_size: int = 64,
+        max_workers: int = 4,
+        progress_callback: Optional[Callable[[UpsertReport], None]] = None
+) -> UpsertReport:
+    """
+    Send points in fixed-size batches using a bounded worker pool.
+
+    Points are pulled from the iterable only when a worker slot is about to be free,
+    so at most about 2 * max_workers batches are held in memory and producing points
+    (e.g. generating embeddings) overlaps with uploading previous batches.
+
+    Parameters:
+        upsert_batch (Callable) : Function sending one batch, e.g. lambda batch: client.upsert(name, points=batch)
+        points (Iterable[PointStruct]) : Points to send, may be a generator
+        batch_size (int) : Number of points per request
+        max_workers (int) : Number of batches sent in parallel
+        progress_callback (Callable, Optional) : Called with current report after every finished batch
+
+    Returns:
+        UpsertReport : Numbers of sent batches/points and failed batches with their errors
+    """
+    report = UpsertReport()
+    max_in_flight = max(1, max_workers) * 2
+
+    def finish(future, batch_index: int, batch: List[PointStruct]) -> None:
+        try:
+            future.result()
+            report.batches_sent += 1
+            report.points_sent += len(batch)
+        except Exception as e:
+            logging.error(f"Upsert of batch {batch_index} ({len(batch)} points) failed: {str(e)}")
+            report.failed_batches.append({
+                "batch_index": batch_index,
+                "point_ids": [point.id for point in batch],
+                "error": str(e)
+            })
+        if progress_callback is not None:
+            progress_callback(report)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        in_flight = {}
+        for batch_index, batch in enumerate(iter_batches(points, batch_size)):
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future, *in_flight.pop(future))
+            in_flight[executor.submit(upsert_batch, batch)] = (batch_index, batch)
+
+        for future in list(in_flight):
+            finish(future, *in_flight.pop(future))
+
+    logging.info(f"Streaming upsert finished: {report.points_sent} points in {report.batches_sent} batches, "
+                 f"{len(report.failed_batches)} failed batches")
+    return report
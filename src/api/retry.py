@@ -0,0 +1,247 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# Statuses meaning that the server did not process the request - safe to retry any request
+SAFE_RETRY_STATUSES = {429, 503}
+# Transient statuses which may come after the request was processed - retry only idempotent requests
+IDEMPOTENT_RETRY_STATUSES = {500, 502, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of regular traffic, so a failing server is not flooded
+    by every caller retrying at once. Each first attempt deposits `ratio` of a retry,
+    each retry withdraws one. `min_retries` is the starting (and minimal refill) balance.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._balance = float(min_retries)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.min_retries + 100 * self.ratio)
+
+    def withdraw(self) -> bool:
+        """ Returns True if retry is allowed. """
+        with self._lock:
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                return True
+            return False
+
+
+class RetryPolicy:
+    """
+    Retry policy for transient API failures: exponential backoff with full jitter,
+    Retry-After support, per-call deadline and shared retry budget.
+
+    Failures are classified with idempotency in mind - requests which may change server
+    state (e.g. POST with an answer) are retried only when the server surely did not
+    process them (connection not established, 429, 503). Every retry increments a counter
+    of its cause, available through stats().
+
+    Usage example:
+    policy = RetryPolicy(max_attempts=5, deadline=60)
+    response = policy.execute(lambda: session.get(url), idempotent=True)
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 5,
+            base_delay: float = 0.5,
+            max_delay: float = 30.0,
+            deadline: Optional[float] = 120.0,
+            budget: Optional[RetryBudget] = None
+    ):
+        """
+        Parameters:
+            max_attempts (int) : Maximum number of attempts, including the first one
+            base_delay (float) : Backoff base in seconds, attempt n waits up to base_delay * 2**(n-1)
+            max_delay (float) : Upper limit of a single backoff (Retry-After from server may be longer)
+            deadline (float, Optional) : Seconds after which no further retry is started, None means no deadline
+            budget (RetryBudget, Optional) : Retry budget, shared by all calls using this policy
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.budget = budget or RetryBudget()
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        """ Return number of retries per cause, e.g. {'status_429': 3, 'connection_error': 1}. """
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, cause: str) -> None:
+        with self._lock:
+            self._counters[cause] += 1
+
+    @staticmethod
+    def is_idempotent(method: str) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS
+
+    @staticmethod
+    def caused_by(error: BaseException, error_types) -> bool:
+        """
+        Check if error or any error it wraps is an instance of error_types.
+        Follows __cause__, __context__, exceptions passed in args and urllib3 MaxRetryError.reason.
+        """
+        pending, seen = [error], set()
+        while pending:
+            current = pending.pop()
+            if current is None or id(current) in seen:
+                continue
+            seen.add(id(current))
+            if isinstance(current, error_types):
+                return True
+            pending.extend([current.__cause__, current.__context__, getattr(current, "reason", None)])
+            pending.extend(arg for arg in getattr(current, "args", ()) if isinstance(arg, BaseException))
+        return False
+
+    @staticmethod
+    def classify(response=None, error: Optional[BaseException] = None, idempotent: bool = True) -> Optional[str]:
+        """
+        Decide if failed attempt can be retried.
+
+        Parameters:
+            response : requests or httpx response, None if request raised
+            error (Exception, Optional) : Exception raised by the request
+            idempotent (bool) : If the request can be safely repeated
+
+        Returns:
+            Optional[str] : Retry cause (used as counter name) or None if attempt must not be retried
+        """
+        if error is not None:
+            # Connection was never established - request did not reach the server
+            if isinstance(error, (requests.exceptions.ConnectTimeout, httpx.ConnectTimeout)):
+                return "connect_timeout"
+            if isinstance(error, httpx.ConnectError):
+                return "connection_error"
+            if isinstance(error, requests.exceptions.ConnectionError) and RetryPolicy.caused_by(error, NewConnectionError):
+                return "connection_error"
+            if not idempotent:
+                return None
+            # Request might have been processed - only idempotent requests are repeated
+            if isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException)):
+                return "timeout"
+            if isinstance(error, (requests.exceptions.ConnectionError, httpx.TransportError)):
+                return "connection_reset"
+            return None
+
+        status = response.status_code
+        if status in SAFE_RETRY_STATUSES:
+            return f"status_{status}"
+        if idempotent and status in IDEMPOTENT_RETRY_STATUSES:
+            return f"status_{status}"
+        return None
+
+    @staticmethod
+    def retry_after(response) -> Optional[float]:
+        """ Return Retry-After header of response in seconds (number or HTTP date), None if missing. """
+        if response is None:
+            return None
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """ Full-jitter exponential backoff, or server Retry-After with small jitter if it was sent. """
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _next_delay(self, attempt: int, cause: str, response, started: float, deadline: Optional[float]) -> Optional[float]:
+        """ Return delay before next attempt or None if retrying is not allowed anymore. """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.compute_delay(attempt, self.retry_after(response))
+        if deadline is not None and time.monotonic() - started + delay > deadline:
+            logging.warning(f"Retry deadline of {deadline}s exceeded, giving up after {attempt} attempts ({cause})")
+            return None
+        if not self.budget.withdraw():
+            logging.warning(f"Retry budget exhausted, giving up after {attempt} attempts ({cause})")
+            return None
+        self._count(cause)
+        logging.warning(f"Attempt {attempt} failed ({cause}), retrying in {delay:.2f}s")
+        return delay
+
+    def execute(self, send: Callable[[], object], idempotent: bool = True, deadline: Optional[float] = None):
+        """
+        Call send() until it succeeds, fails permanently or retries run out.
+
+        Parameters:
+            send (Callable) : Function sending the request and returning response
+            idempotent (bool) : If the request can be safely repeated
+            deadline (float, Optional) : Overrides policy deadline for this call
+
+        Returns:
+            Response of the last attempt (may be an error response - handling it is up to the caller)
+
+        Raises:
+            Exception raised by the last attempt, if it raised
+        """
+        deadline = self.deadline if deadline is None else deadline
+        started = time.monotonic()
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            response, error = None, None
+            try:
+                response = send()
+            except (requests.exceptions.RequestException, httpx.HTTPError) as e:
+                error = e
+
+            cause = self.classify(response, error, idempotent)
+            delay = self._next_delay(attempt, cause, response, started, deadline) if cause else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+
+    async def execute_async(self, send: Callable[[], Awaitable[object]], idempotent: bool = True, deadline: Optional[float] = None):
+        """ Coroutine version of execute(), send is a coroutine function. """
+        deadline = self.deadline if deadline is None else deadline
+        started = time.monotonic()
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            response, error = None, None
+            try:
+                response = await send()
+            except (requests.exceptions.RequestException, httpx.HTTPError) as e:
+                error = e
+
+            cause = self.classify(response, error, idempotent)
+            delay = self._next_delay(attempt, cause, response, started, deadline) if cause else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
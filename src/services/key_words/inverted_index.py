@@ -0,0 +1,168 @@
+import os
+import json
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.services.key_words.keyword_set import KeywordSet
+
+
+class InvertedIndex:
+    """
+    Inverted index of keywords: normalized keyword -> posting list of document ids.
+
+    Keywords are normalized like in KeywordSet (casefold + optional normalizer), so
+    'Barbara' and 'barbara' share one posting list. Posting lists keep documents in
+    the order they were indexed. The index can be saved to JSON and updated
+    incrementally from MetadataBuilder output - only documents whose keywords changed
+    are re-indexed.
+
+    Usage example:
+    index = InvertedIndex.load("tasks/s03e01-key_words/content/facts_index.json")
+    index.update_from_metadata(facts)
+    index.query_and(["Barbara", "AI"])      # ids of documents with both keywords
+    index.query_or(["Barbara", "AI"])       # ids of documents with any keyword, most matches first
+    index.save("tasks/s03e01-key_words/content/facts_index.json")
+    """
+
+    VERSION = 1
+
+    def __init__(self, normalizer: Optional[Callable[[str], str]] = None):
+        """
+        Parameters:
+            normalizer (Callable, Optional) : Keyword normalization hook, as in KeywordSet
+        """
+        self._keywords = KeywordSet(normalizer=normalizer)
+        self._postings: Dict[str, Dict[str, None]] = {}  # dict used as ordered set of document ids
+        self._documents: Dict[str, List[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        """ Number of indexed documents. """
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add_document(self, doc_id: str, keywords: Iterable[str]) -> None:
+        """
+        Index document keywords, replacing previous keywords of the same document.
+
+        Parameters:
+            doc_id (str) : Document id, e.g. filename
+            keywords (Iterable[str]) : Keywords of the document
+        """
+        if doc_id in self._documents:
+            self.remove_document(doc_id)
+        unique = KeywordSet(keywords, self._keywords.normalizer)
+        self._documents[doc_id] = unique.to_list()
+        self._order[doc_id] = self._next_position
+        self._next_position += 1
+        for keyword in unique:
+            self._postings.setdefault(self._keywords.normalize(keyword), {})[doc_id] = None
+
+    def remove_document(self, doc_id: str) -> bool:
+        """ Remove document from the index, returns False if it was not indexed. """
+        keywords = self._documents.pop(doc_id, None)
+        if keywords is None:
+            return False
+        self._order.pop(doc_id, None)
+        for keyword in keywords:
+            key = self._keywords.normalize(keyword)
+            posting = self._postings.get(key)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[key]
+        return True
+
+    def update_from_metadata(self, metadata_list: List[Dict], id_field: str = "filename", keywords_field: str = "keywords", remove_missing: bool = False) -> int:
+        """
+        Incrementally index MetadataBuilder output - documents with unchanged keywords are skipped.
+
+        Parameters:
+            metadata_list (List[Dict]) : Dictionaries with document id and keywords
+            id_field (str) : Key of document id
+            keywords_field (str) : Key of keywords list
+            remove_missing (bool) : Remove indexed documents which are not in metadata_list
+
+        Returns:
+            int : Number of added, changed or removed documents
+        """
+        updated = 0
+        seen = set()
+        for metadata in metadata_list:
+            doc_id = metadata[id_field]
+            seen.add(doc_id)
+            keywords = KeywordSet(metadata.get(keywords_field) or [], self._keywords.normalizer).to_list()
+            if self._documents.get(doc_id) == keywords:
+                continue
+            self.add_document(doc_id, keywords)
+            updated += 1
+        if remove_missing:
+            for doc_id in [doc_id for doc_id in self._documents if doc_id not in seen]:
+                self.remove_document(doc_id)
+                updated += 1
+        logging.info(f"Inverted index updated: {updated} documents changed, {len(self)} documents indexed")
+        return updated
+
+    def keywords_of(self, doc_id: str) -> List[str]:
+        """ Keywords of indexed document (empty list if not indexed). """
+        return list(self._documents.get(doc_id, []))
+
+    def lookup(self, keyword: str) -> List[str]:
+        """ Ids of documents containing keyword, in indexing order. """
+        return list(self._postings.get(self._keywords.normalize(keyword), {}))
+
+    def query_and(self, keywords: Iterable[str]) -> List[str]:
+        """
+        Ids of documents containing all keywords, in indexing order.
+        Intersection starts from the shortest posting list.
+        """
+        postings = [self._postings.get(self._keywords.normalize(keyword), {}) for keyword in keywords]
+        if not postings:
+            return []
+        postings.sort(key=len)
+        result = [doc_id for doc_id in postings[0] if all(doc_id in posting for posting in postings[1:])]
+        return sorted(result, key=self._order.__getitem__)
+
+    def query_or(self, keywords: Iterable[str]) -> List[str]:
+        """ Ids of documents containing any of keywords - most matched keywords first, then indexing order. """
+        matches: Dict[str, int] = {}
+        for key in {self._keywords.normalize(keyword) for keyword in keywords}:
+            for doc_id in self._postings.get(key, {}):
+                matches[doc_id] = matches.get(doc_id, 0) + 1
+        return sorted(matches, key=lambda doc_id: (-matches[doc_id], self._order[doc_id]))
+
+    def save(self, path: str) -> None:
+        """ Save indexed documents to JSON file atomically (posting lists are rebuilt on load). """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"version": self.VERSION, "documents": self._documents}, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+        logging.info(f"Inverted index with {len(self)} documents saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, normalizer: Optional[Callable[[str], str]] = None) -> "InvertedIndex":
+        """
+        Load index saved with save(). Returns empty index if file does not exist.
+
+        Parameters:
+            path (str) : Path of JSON file
+            normalizer (Callable, Optional) : Keyword normalization hook, must be the same as used before
+
+        Returns:
+            InvertedIndex : Loaded index
+        """
+        index = cls(normalizer)
+        if not os.path.exists(path):
+            return index
+        with open(path, 'r', encoding='utf-8') as file:
+            documents = json.load(file).get("documents", {})
+        for doc_id, keywords in documents.items():
+            index.add_document(doc_id, keywords)
+        logging.info(f"Inverted index with {len(index)} documents loaded from {path}")
+        return index
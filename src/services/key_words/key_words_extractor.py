@@ -1,7 +1,8 @@
 import sys
 import logging
+import threading
 
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Union
 from pathlib import Path
 
 # Add project root to Python path
@@ -11,9 +12,28 @@ sys.path.append(project_root)
 from src.utils.file_handler import FileHandler
 from src.utils.text_processor import TextProcessor
 from src.api.openai.client import OpenAIClient
+from src.services.key_words.keyword_set import KeywordSet
+
+# Appended to the system prompt in batched mode - describes the numbered input and output format
+BATCH_PROMPT_SUFFIX = """
+
+<batch_format>
+The message contains several independent paragraphs, each in a <paragraph id="N"> tag.
+Apply the rules above to every paragraph separately and answer with one
+<keywords id="N">...</keywords> block per paragraph, using the same id and keeping the order.
+Do not skip any paragraph.
+</batch_format>"""
+
 
 class KeyWordsGenerator:
-    def __init__(self, llm_system_prompt_path: str):
+    def __init__(
+            self,
+            llm_system_prompt_path: str,
+            batch_paragraphs: bool = False,
+            max_batch_tokens: int = 2000,
+            max_batch_paragraphs: int = 20,
+            keyword_normalizer: Optional[Callable[[str], str]] = None
+    ):
         """
         Initialization of class
 
@@ -22,53 +42,82 @@ class KeyWordsGenerator:
             handler : instance of FileHandler
             text_path (str) : Path to the analysed text file
             llm_prompt_path (str) : Path to the llm system prompt control key words generation
+            batch_paragraphs (bool) : If True, several paragraphs are sent in one request (see generate_keywords_batched)
+            max_batch_tokens (int) : Estimated tokens of paragraphs packed into one request
+            max_batch_paragraphs (int) : Maximum number of paragraphs in one request
+            keyword_normalizer (Callable, Optional) : Normalization hook of KeywordSet (e.g. lemmatizer) used for deduplication
         """
         self.client_openai = OpenAIClient()
         self.handler = FileHandler()
         self.text_processor = TextProcessor()
         self.llm_system_prompt = self.handler.load_txt(llm_system_prompt_path)
+        self.batch_paragraphs = batch_paragraphs
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_paragraphs = max_batch_paragraphs
+        self.keyword_normalizer = keyword_normalizer
+        # Per thread: (list, its KeywordSet, number of list items already in the set) of the last check_keyword call
+        self._checked_keywords = threading.local()
 
-    @staticmethod
-    def check_keyword(keyword: str, keywords_list: list) -> bool:
+    def keyword_set(self, keywords: Iterable[str] = ()) -> KeywordSet:
+        """ Create KeywordSet using the configured normalizer. """
+        return KeywordSet(keywords, self.keyword_normalizer)
+
+    def check_keyword(self, keyword: str, keywords_list: Union[list, KeywordSet]) -> bool:
         """
-        Check if the keyword exists in the keywords list.
+        Check if the keyword exists in the keywords list, comparing normalized forms.
+
+        Set of the last checked list is kept and extended with appended keywords, so repeated
+        checks against the same (growing) list are O(1). Replacing items of the list in place
+        is not detected - pass a KeywordSet (see keyword_set) in such case.
 
         Parameters:
             keyword (str): The keyword to check
-            keywords_list (List[str]) : List of existing keywords
+            keywords_list (List[str] or KeywordSet) : Existing keywords
 
         Returns:
             bool: True if keyword exists in keywords_list, False otherwise
         """
-        return keyword.lower() in [word.lower() for word in keywords_list]
+        if isinstance(keywords_list, KeywordSet):
+            return keyword in keywords_list
+        cached_list, cached_set, cached_length = getattr(self._checked_keywords, "value", (None, None, 0))
+        if cached_list is not keywords_list or cached_length > len(keywords_list):
+            cached_set, cached_length = self.keyword_set(), 0
+        cached_set.update(keywords_list[cached_length:])
+        self._checked_keywords.value = (keywords_list, cached_set, len(keywords_list))
+        return keyword in cached_set
     
-    def llm_reponse(self, text: str) -> str:
+    def llm_reponse(self, text: str, system_prompt: Optional[str] = None, max_tokens: int = 1000) -> str:
         resposne = self.client_openai.generate_response(
-            system_prompt=self.llm_system_prompt,
+            system_prompt=system_prompt or self.llm_system_prompt,
             message=text,
             model="gpt-4o",
-            max_tokens=1000,
+            max_tokens=max_tokens,
             temperature=1.0,
             top_p=1.0
         )
         return resposne
 
-    def process_keywords_from_text(self, text: str, keywords_list: list) -> list:
+    def process_keywords_from_text(self, text: str, keywords_list: Union[list, KeywordSet]) -> Union[list, KeywordSet]:
         """
         Process text to extract and validate keywords against existing keywords list.
 
         Parameters:
             text (str): Text containing potential keywords
-            existing_keywords(List[str]): List of existing keywords
+            existing_keywords(List[str] or KeywordSet): Existing keywords - list is extended in place
 
         Returns:
-            List[str]: Updated list of keywords
+            List[str] or KeywordSet: Updated keywords, same type as given
         """
 
         words = self.text_processor.tokenize_text(text)
 
+        if isinstance(keywords_list, KeywordSet):
+            keywords_list.update(words)
+            return keywords_list
+
+        existing = self.keyword_set(keywords_list)
         for word in words:
-            if not self.check_keyword(word, keywords_list):
+            if existing.add(word):
                 keywords_list.append(word)
         
         return keywords_list
@@ -78,19 +127,47 @@ class KeyWordsGenerator:
         """
         Generate list of key words for given text.
 
+        Returns:
+            List [str] : List of key words
+        """
+        try:
+            text = self.handler.load_txt(text_path)
+        except FileNotFoundError as e:
+            logging.error(f"File not found at {text_path}: {str(e)}")
+            raise
+        except Exception as e:
+            logging.error(f"Error generating keywords: {str(e)}")
+            return []
+        return self.generate_keywords_from_text(text, text_path)
+
+
+    def generate_keywords_from_text(self, text: str, source: str = "text", errors: Optional[List[str]] = None) -> list:
+        """
+        Generate list of key words for already loaded text.
+        Failed paragraphs are skipped, so the result may be partial - pass errors to find out.
+
+        Parameters:
+            text (str) : Analysed text
+            source (str) : Name of text source used in logs, e.g. file path
+            errors (List[str], Optional) : If given, messages of failed requests are appended to it
+
         Returns:
             List [str] : List of key words
         """
         try:
             # Initializaiton of keywords_list
-            keywords_list = []
+            keywords_list = KeywordSet(normalizer=self.keyword_normalizer)
 
-            text = self.handler.load_txt(text_path)
             text_chanks = self.text_processor.split_text_into_chanks(text, "\n")
             
             # Check if text is "entry deleted" first
             if self.text_processor.check_text_contain(text.strip(), "entry deleted"):
-                return keywords_list
+                return keywords_list.to_list()
+
+            if self.batch_paragraphs:
+                for keywords_text in self.generate_keywords_batched(text_chanks, source, errors):
+                    keywords_list = self.process_keywords_from_text(keywords_text, keywords_list)
+                return keywords_list.to_list()
 
             for paragraph in text_chanks:
                 try:
@@ -99,25 +176,90 @@ class KeyWordsGenerator:
                     keywords_text = self.text_processor.extract_text_between_tags(llm_response, "keywords")
                     keywords_list = self.process_keywords_from_text(keywords_text, keywords_list)
                 except Exception as e:
-                    logging.error(f"Error processing paragraph in {text_path} : {str(e)}")
+                    logging.error(f"Error processing paragraph in {source} : {str(e)}")
+                    if errors is not None:
+                        errors.append(str(e))
                     continue
 
-            return keywords_list
+            return keywords_list.to_list()
         
-        except FileNotFoundError as e:
-            logging.error(f"File not found at {self.text_path}: {str(e)}")
-            raise
         except Exception as e:
             logging.error(f"Error generating keywords: {str(e)}")
-            return keywords_list
+            if errors is not None:
+                errors.append(str(e))
+            return keywords_list.to_list()
 
 
-        
-                    
+    def pack_paragraphs(self, paragraphs: List[str]) -> List[List[int]]:
+        """
+        Split paragraphs into batches of consecutive indexes, within token and paragraph limits.
+        Paragraph larger than the token budget gets a batch of its own.
 
-    
-                
+        Parameters:
+            paragraphs (List[str]) : Paragraphs of text
 
+        Returns:
+            List[List[int]] : Indexes of paragraphs in each batch
+        """
+        batches, current, current_tokens = [], [], 0
+        for index, paragraph in enumerate(paragraphs):
+            tokens = self.text_processor.estimate_tokens(paragraph)
+            if current and (current_tokens + tokens > self.max_batch_tokens or len(current) >= self.max_batch_paragraphs):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
 
 
+    def generate_keywords_batched(self, paragraphs: List[str], source: str = "text", errors: Optional[List[str]] = None) -> List[str]:
+        """
+        Generate keywords of many paragraphs with one LLM request per batch instead of one per paragraph.
 
+        Paragraphs are sent as numbered <paragraph id="N"> tags and the answer is parsed back from
+        <keywords id="N"> blocks. Paragraphs missing in the answer (or whole batch if request failed)
+        are processed with single requests, as in the non-batched mode.
+
+        Parameters:
+            paragraphs (List[str]) : Paragraphs of text
+            source (str) : Name of text source used in logs
+            errors (List[str], Optional) : If given, messages of paragraphs which failed also in single request are appended to it
+
+        Returns:
+            List[str] : Raw keywords text for each paragraph, in paragraph order ('' if extraction failed)
+        """
+        results = [""] * len(paragraphs)
+        for batch in self.pack_paragraphs(paragraphs):
+            parsed = {}
+            if len(batch) > 1:
+                message = "\n".join(
+                    f'<paragraph id="{number}">\n{paragraphs[index]}\n</paragraph>'
+                    for number, index in enumerate(batch, start=1)
+                )
+                try:
+                    llm_response = self.llm_reponse(
+                        message,
+                        system_prompt=self.llm_system_prompt + BATCH_PROMPT_SUFFIX,
+                        max_tokens=min(4096, 300 * len(batch) + 200)
+                    )
+                    logging.info(f"LLm response for batch of {len(batch)} paragraphs in {source}:\n{llm_response}")
+                    parsed = self.text_processor.extract_numbered_tags(llm_response, "keywords")
+                except Exception as e:
+                    logging.error(f"Error processing batch of paragraphs in {source} : {str(e)}")
+
+            for number, index in enumerate(batch, start=1):
+                if number in parsed:
+                    results[index] = parsed[number]
+                    continue
+                if len(batch) > 1:
+                    logging.warning(f"No keywords for paragraph {number} of batch in {source}, falling back to single request")
+                try:
+                    llm_response = self.llm_reponse(paragraphs[index])
+                    results[index] = self.text_processor.extract_text_between_tags(llm_response, "keywords")
+                except Exception as e:
+                    logging.error(f"Error processing paragraph in {source} : {str(e)}")
+                    if errors is not None:
+                        errors.append(str(e))
+        return results
@@ -0,0 +1,74 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class KeywordSet:
+    """
+    Ordered set of keywords with case-insensitive membership.
+
+    Keywords are compared by their normalized form - stripped and Unicode casefolded
+    ('Straße' == 'STRASSE'), optionally passed through a normalizer (e.g. lemmatizer
+    or stemmer). The first spelling of every keyword is kept and returned in insertion
+    order. Membership check and adding are O(1).
+
+    Usage example:
+    keywords = KeywordSet(["Barbara", "AI"])
+    keywords.add("barbara")       # False - already present
+    keywords.update(["robot", "Robot", "AI"])
+    keywords.to_list()            # ['Barbara', 'AI', 'robot']
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), normalizer: Optional[Callable[[str], str]] = None):
+        """
+        Parameters:
+            keywords (Iterable[str]) : Initial keywords
+            normalizer (Callable, Optional) : Applied to casefolded keyword, e.g. lemmatization - words with the same result are duplicates
+        """
+        self.normalizer = normalizer
+        self._keywords: Dict[str, str] = {}
+        self.update(keywords)
+
+    def normalize(self, keyword: str) -> str:
+        """ Return form of keyword used for comparison. """
+        key = keyword.strip().casefold()
+        if self.normalizer is not None:
+            key = self.normalizer(key)
+        return key
+
+    def add(self, keyword: str) -> bool:
+        """
+        Add keyword if it is not present yet.
+
+        Returns:
+            bool : True if keyword was added, False if it was a duplicate or empty
+        """
+        key = self.normalize(keyword)
+        if not key or key in self._keywords:
+            return False
+        self._keywords[key] = keyword.strip()
+        return True
+
+    def update(self, keywords: Iterable[str]) -> int:
+        """ Add many keywords, returns number of added ones. """
+        return sum(1 for keyword in keywords if self.add(keyword))
+
+    def get(self, keyword: str) -> Optional[str]:
+        """ Return stored spelling of keyword or None if it is not present. """
+        return self._keywords.get(self.normalize(keyword))
+
+    def discard(self, keyword: str) -> None:
+        self._keywords.pop(self.normalize(keyword), None)
+
+    def to_list(self) -> List[str]:
+        return list(self._keywords.values())
+
+    def __contains__(self, keyword: str) -> bool:
+        return self.normalize(keyword) in self._keywords
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keywords.values())
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def __repr__(self) -> str:
+        return f"KeywordSet({self.to_list()!r})"
@@ -11,6 +11,7 @@ sys.path.append(project_root)
 
 from src.utils.file_handler import FileHandler
 from src.utils.text_processor import TextProcessor
+from src.utils.ingestion_manifest import KeywordCache
 from src.api.openai.client import OpenAIClient
 from src.services.key_words.key_words_extractor import KeyWordsGenerator
 
@@ -41,12 +42,16 @@ class MetadataBuilder:
         }
         return file_metadata
     
-    def generate_files_metadata(self, directory_path: str) -> list[Dict]:
+    def generate_files_metadata(self, directory_path: str, keywords_cache_path: Optional[str] = None) -> list[Dict]:
         """
         Generates metadata for all files in the specified directory.
 
         Parameters:
             directory_path (str): Path to direcotry containing files to process
+            keywords_cache_path (Optional[str]): Path of KeywordCache - if given, keywords of files whose content
+                                                 did not change since the previous run are taken from the cache
+                                                 instead of being generated again. Only files whose keywords were
+                                                 generated without errors are cached
 
         Returns:
             list[Dict]: List of metadata dictionaries for each file, where each dictionary contains:
@@ -70,14 +75,29 @@ class MetadataBuilder:
         files = self.file_handler.get_list_file_paths_from_direcotry(directory_path, ['.txt'])
         logging.info(f"Found {len(files)} files to process")
 
+        cache = KeywordCache(keywords_cache_path, root=directory_path) if keywords_cache_path else None
+        diff = cache.diff(files) if cache else None
+        unchanged = set(diff.unchanged) if diff else set()
+
         for file_path in files:
+            text_content = ""
             try:
                 logging.info(f"Processing file: {Path(file_path).name}")
                 text_content = self.file_handler.load_txt(file_path)
 
-                # Generate keywords for file content
-                keywords = self.keywords_generator.generate_keywords(file_path)
-                logging.info(f"Generated {len(keywords)} keywords for {Path(file_path).name}")
+                if file_path in unchanged:
+                    keywords = cache.get(file_path)["keywords"]
+                    logging.info(f"Reused {len(keywords)} keywords of unchanged file {Path(file_path).name}")
+                else:
+                    # Generate keywords for file content
+                    errors = []
+                    keywords = self.keywords_generator.generate_keywords_from_text(text_content, file_path, errors)
+                    logging.info(f"Generated {len(keywords)} keywords for {Path(file_path).name}")
+                    if cache and not errors:
+                        cache.record(file_path, diff.hashes[file_path], keywords=keywords)
+                    elif cache:
+                        # Partial keywords are used now, but the file is generated again next time
+                        cache.remove(cache.file_key(file_path))
 
                 # Create metadata object from file
                 file_metadata = self.get_metadata(
@@ -96,6 +116,11 @@ class MetadataBuilder:
                     keywords=[]
                 )
                 metadata_list.append(file_metadata)
+
+        if cache:
+            for key in diff.removed:
+                cache.remove(key)
+            cache.save()
         
         return metadata_list
     
@@ -0,0 +1,61 @@
+import sys
+import logging
+
+from typing import Dict, List, Optional
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent.parent.parent)
+sys.path.append(project_root)
+
+from src.api.openai.client import OpenAIClient
+from src.api.qdrant.client import QdrantClient
+
+
+class QuestionSearcher:
+    """
+    Answers a set of questions with semantic search in one round trip per stage:
+    all questions are embedded with one batched embedding call and searched with
+    one Qdrant batch search request.
+    """
+
+    def __init__(self, qdrant_client: Optional[QdrantClient] = None, openai_client: Optional[OpenAIClient] = None):
+        """
+        Parameters:
+            qdrant_client : Client used for search - QdrantClient or LocalQdrantClient
+            openai_client : Client used for embeddings
+        """
+        self.qdrant_client = qdrant_client or QdrantClient()
+        self.openai_client = openai_client or OpenAIClient()
+
+    def search_questions(
+            self,
+            collection_name: str,
+            questions: List[str],
+            limit: int = 5,
+            filters=None,
+            embedding_model: str = "text-embedding-3-small"
+    ) -> List[List[Dict]]:
+        """
+        Find nearest points for every question.
+
+        Parameters:
+            collection_name (str) : Name of collection
+            questions (List[str]) : Questions to answer
+            limit (int) : Limit of returned points per question
+            filters (Optional) : Payload filter applied to every question
+            embedding_model (str) : Model used to embed questions - must match model used for collection points
+
+        Returns:
+            List[List[Dict]] : Search results ({'id', 'score', 'payload'}) for each question, in question order
+        """
+        if not questions:
+            return []
+        query_vectors = self.openai_client.generate_embeddings(questions, model=embedding_model)
+        logging.info(f"Embedded {len(questions)} questions, searching collection {collection_name}")
+        return self.qdrant_client.search_points_batch(
+            collection_name=collection_name,
+            query_vectors=query_vectors,
+            limit=limit,
+            filters=filters
+        )
@@ -0,0 +1,180 @@
+import os
+import json
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """
+    Compact on-disk store of embeddings.
+
+    Directory layout:
+    - vectors.f32 : raw row-major float32 matrix, one row per point
+    - points.jsonl : one JSON line per row with point id and payload
+    - meta.json : vector dimension and dtype
+
+    Vectors are loaded zero-copy with numpy.memmap and new batches are appended
+    to the end of both files, without rewriting what is already stored.
+
+    Usage example:
+    store = EmbeddingStore("tasks/s03e02-semantic_search/store")
+    store.append(ids, embeddings_matrix, payloads)
+    ids, vectors, payloads = store.load()
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    POINTS_FILE = "points.jsonl"
+    META_FILE = "meta.json"
+    DTYPE = np.float32
+
+    def __init__(self, directory: str):
+        """
+        Parameters:
+            directory (str) : Directory of the store, created if it does not exist
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, self.VECTORS_FILE)
+        self.points_path = os.path.join(directory, self.POINTS_FILE)
+        self.meta_path = os.path.join(directory, self.META_FILE)
+        self.dim: Optional[int] = self._load_dim()
+        # ((points file size, vectors file size), number of complete rows) of the last validation
+        self._rows_cache: Optional[Tuple[Tuple[int, int], int]] = None
+
+    def _load_dim(self) -> Optional[int]:
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, 'r', encoding='utf-8') as file:
+            return json.load(file)["dim"]
+
+    def _save_meta(self) -> None:
+        with open(self.meta_path, 'w', encoding='utf-8') as file:
+            json.dump({"dim": self.dim, "dtype": np.dtype(self.DTYPE).name}, file)
+
+    def _count_point_lines(self, chunk_size: int = 1024 * 1024) -> int:
+        """ Number of complete (newline terminated) sidecar lines - reads the whole file. """
+        lines = 0
+        with open(self.points_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                lines += chunk.count(b"\n")
+        return lines
+
+    def _complete_points_size(self, chunk_size: int = 64 * 1024) -> int:
+        """
+        Size in bytes of the sidecar part made of complete lines. Only the tail of the file is read -
+        a last line without newline is left by an interrupted write.
+        """
+        end = os.path.getsize(self.points_path)
+        with open(self.points_path, 'rb') as file:
+            while end > 0:
+                start = max(0, end - chunk_size)
+                file.seek(start)
+                chunk = file.read(end - start)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    return start + newline + 1
+                end = start
+        return 0
+
+    def _file_sizes(self) -> Tuple[int, int]:
+        vectors_size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        return os.path.getsize(self.points_path), vectors_size
+
+    def __len__(self) -> int:
+        """
+        Number of complete rows - rows without a full sidecar line (interrupted append) are ignored.
+        Files are scanned only on first call or after they were changed by someone else, otherwise
+        the count kept by append is used.
+        """
+        if self.dim is None or not os.path.exists(self.points_path):
+            return 0
+        sizes = self._file_sizes()
+        if self._rows_cache is not None and self._rows_cache[0] == sizes:
+            return self._rows_cache[1]
+        row_bytes = self.dim * np.dtype(self.DTYPE).itemsize
+        rows = min(sizes[1] // row_bytes, self._count_point_lines())
+        self._rows_cache = (sizes, rows)
+        return rows
+
+    def append(self, ids: Sequence[str], vectors, payloads: Optional[Sequence[Dict]] = None) -> None:
+        """
+        Append batch of points to the store.
+
+        Parameters:
+            ids (Sequence[str]) : Point ids
+            vectors (np.ndarray or List[List[float]]) : Embeddings, shape (len(ids), dim)
+            payloads (Sequence[Dict], Optional) : Payload of each point
+
+        Raises:
+            ValueError: If lengths or vector dimension do not match the store
+        """
+        matrix = np.ascontiguousarray(vectors, dtype=self.DTYPE)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError(f"Expected matrix with {len(ids)} rows, got shape {matrix.shape}")
+        if payloads is None:
+            payloads = [{} for _ in ids]
+        if len(payloads) != len(ids):
+            raise ValueError("Number of payloads does not match number of ids")
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+            self._save_meta()
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(f"Vector dimension {matrix.shape[1]} does not match store dimension {self.dim}")
+
+        # Drop a partial sidecar line and vectors left by an interrupted append, so rows stay aligned
+        if os.path.exists(self.points_path):
+            complete_size = self._complete_points_size()
+            if os.path.getsize(self.points_path) != complete_size:
+                os.truncate(self.points_path, complete_size)
+        rows = len(self)
+        stored_bytes = rows * self.dim * np.dtype(self.DTYPE).itemsize
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != stored_bytes:
+            os.truncate(self.vectors_path, stored_bytes)
+
+        # Vectors first - a row counts as stored only once its sidecar line exists
+        with open(self.vectors_path, 'ab') as file:
+            file.write(matrix.tobytes())
+        with open(self.points_path, 'a', encoding='utf-8') as file:
+            for point_id, payload in zip(ids, payloads):
+                file.write(json.dumps({"id": str(point_id), "payload": payload}, ensure_ascii=False) + "\n")
+        self._rows_cache = (self._file_sizes(), rows + len(ids))
+        logging.info(f"Appended {len(ids)} points to embedding store {self.directory}")
+
+    def load_vectors(self) -> np.ndarray:
+        """
+        Memory-map stored vectors.
+
+        Returns:
+            np.ndarray : Read-only float32 matrix of shape (len(store), dim), backed by the file
+        """
+        rows = len(self)
+        if rows == 0:
+            return np.empty((0, self.dim or 0), dtype=self.DTYPE)
+        return np.memmap(self.vectors_path, dtype=self.DTYPE, mode='r', shape=(rows, self.dim))
+
+    def iter_records(self) -> Iterator[Dict]:
+        """ Yield {'id', 'payload'} records in row order, a partial last line is skipped. """
+        if not os.path.exists(self.points_path):
+            return
+        with open(self.points_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.endswith("\n") and line.strip():
+                    yield json.loads(line)
+
+    def load(self) -> Tuple[List[str], np.ndarray, List[Dict]]:
+        """
+        Load whole store.
+
+        Returns:
+            Tuple: (ids, vectors, payloads) - vectors are memory-mapped, row i belongs to ids[i]
+        """
+        vectors = self.load_vectors()
+        ids, payloads = [], []
+        for record in self.iter_records():
+            if len(ids) == vectors.shape[0]:
+                break
+            ids.append(record["id"])
+            payloads.append(record["payload"])
+        return ids, vectors, payloads
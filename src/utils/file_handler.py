@@ -1,12 +1,89 @@
 import json
+import mmap
+import codecs
 import logging
 import base64
 import imghdr
 from pathlib import Path
 import csv
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson  # optional, faster JSON backend
+except ImportError:
+    orjson = None
+
+from src.utils.text_processor import TextProcessor
+from src.utils.directory_scanner import DirectoryScanner
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+
+def dumps_compact(data: Any) -> str:
+    """ Serialize data to single-line JSON, with orjson if it is installed. """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads_fast(text) -> Any:
+    """ Parse JSON text or bytes, with orjson if it is installed. """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class JSONLWriter:
+    """
+    Writer of JSON Lines file which keeps the file open - one compact JSON record per line.
+
+    Usage example:
+    with FileHandler.open_jsonl_writer("points.jsonl") as writer:
+        for point in points:
+            writer.write(point)
+    """
+
+    def __init__(self, file_path: str, mode: str = 'a', flush_every: int = 0):
+        """
+        Parameters:
+            file_path (str) : Path of .jsonl file
+            mode (str) : 'a' to append, 'w' to overwrite
+            flush_every (int) : Flush file after every N records, 0 leaves it to the OS buffer
+        """
+        self.file_path = file_path
+        self.flush_every = flush_every
+        self.count = 0
+        self._file = open(file_path, mode, encoding='utf-8')
+
+    def write(self, record: Any) -> None:
+        self._file.write(dumps_compact(record) + "\n")
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def write_many(self, records: Iterable[Any]) -> int:
+        """ Write all records, returns number of written records. """
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        return written
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            logging.info(f"Successfully saved {self.count} records to JSONL file: {self.file_path}")
+
+    def __enter__(self) -> "JSONLWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
 class FileHandler():
     """
     Class allow to sava and read files , ex. '.txt', '.json' 
@@ -15,7 +92,9 @@ class FileHandler():
     - read text from disc (.txt)
     - save text files to disc (.txt)
     - read JSON files from disc (.json)
-    - save JSON files to disc (.json)
+    - save JSON files to disc (.json), also compact
+    - stream JSON Lines (.jsonl) and large JSON arrays record by record
+    - memory-map text files and iterate over their chunks, lines or paragraphs lazily
     - load image and return its base64 encoded string
     - save to csv
 
@@ -29,7 +108,7 @@ class FileHandler():
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
-                logging.info(f"Successfully loaded file from path: {file_path}")
+                logging.debug(f"Successfully loaded file from path: {file_path}")
                 return content
         except FileNotFoundError:
             logging.error(f"Text file not found! Check path : {file_path}")
@@ -38,6 +117,85 @@ class FileHandler():
             logging.error(f"Error occured during loading content from file: {e}")
             raise
 
+    @staticmethod
+    @contextmanager
+    def mmap_file(file_path: str) -> Iterator[Any]:
+        """
+        Memory-map file read-only - pages are loaded by the OS on access, nothing is copied up front.
+
+        Usage example:
+        with FileHandler.mmap_file("transcript.txt") as data:
+            position = data.find(b"Barbara")
+
+        Yields:
+            mmap.mmap (bytes-like) - empty bytes for empty file
+        """
+        with open(file_path, 'rb') as file:
+            if Path(file_path).stat().st_size == 0:
+                yield b""
+                return
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+
+    @staticmethod
+    def iter_text_chunks(file_path: str, chunk_size: int = 1024 * 1024, encoding: str = 'utf-8') -> Iterator[str]:
+        """
+        Read text file as memory-mapped bytes and decode it chunk by chunk.
+        Incremental decoder keeps multi-byte characters split between chunks intact.
+
+        Parameters:
+            file_path (str) : Path of text file
+            chunk_size (int) : Number of bytes decoded at once
+            encoding (str) : Text encoding
+
+        Yields:
+            str : Decoded text chunks, joined they give the whole file content
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        with FileHandler.mmap_file(file_path) as data:
+            for start in range(0, len(data), chunk_size):
+                text = decoder.decode(data[start:start + chunk_size])
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+    @staticmethod
+    def iter_lines(file_path: str, keep_ends: bool = False) -> Iterator[str]:
+        """
+        Iterate over lines of text file lazily, one line in memory at a time.
+
+        Parameters:
+            file_path (str) : Path of text file
+            keep_ends (bool) : Keep line ending characters
+
+        Yields:
+            str : Each line
+        """
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                yield line if keep_ends else line.rstrip("\r\n")
+
+    @staticmethod
+    def iter_paragraphs(file_path: str, end_signs: str = "\n", chunk_size: int = 1024 * 1024) -> Iterator[str]:
+        """
+        Lazy version of TextProcessor.split_text_into_chanks for a file - yields the same
+        stripped, non-empty paragraphs without loading the whole file.
+
+        Parameters:
+            file_path (str) : Path of text file
+            end_signs (str) : Paragraph separator
+            chunk_size (int) : Number of bytes read at once
+
+        Yields:
+            str : Each paragraph
+        """
+        yield from TextProcessor.iter_chanks(FileHandler.iter_text_chunks(file_path, chunk_size), end_signs)
+
     @staticmethod
     def save_txt(file_path: str, content: str) -> None:
         try:
@@ -65,14 +223,163 @@ class FileHandler():
             logging.error(f"Error occured during loading content from file: {e}")
 
     @staticmethod
-    def save_json(file_path: str, data: dict) -> None:
+    def save_json(file_path: str, data: dict, compact: bool = False) -> None:
+        """
+        Save data as JSON file.
+
+        Parameters:
+            file_path (str) : Path of JSON file
+            data : JSON-serializable data
+            compact (bool) : If True, file is written without indentation (with orjson if installed) - smaller and faster
+        """
         try:
             with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, ensure_ascii=False, indent=4)
+                if compact:
+                    file.write(dumps_compact(data))
+                else:
+                    json.dump(data, file, ensure_ascii=False, indent=4)
                 logging.info(f"Successfully saved JSON file: {file_path}")
         except Exception as e:
             logging.error(f"Error occured during saving JSON file: {e}")
 
+    @staticmethod
+    def iter_jsonl(file_path: str) -> Iterator[Any]:
+        """
+        Read JSON Lines file record by record - only one line is held in memory.
+
+        Parameters:
+            file_path (str) : Path of .jsonl file
+
+        Yields:
+            Parsed record of each non-empty line
+
+        Raises:
+            json.JSONDecodeError / orjson.JSONDecodeError : With line number in log, if line is not valid JSON
+        """
+        with open(file_path, 'rb') as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield loads_fast(line)
+                except ValueError:
+                    logging.error(f"JSON decoding error in file: {file_path}, line {line_number}")
+                    raise
+
+    @staticmethod
+    def append_jsonl(file_path: str, records: Iterable[Any]) -> int:
+        """
+        Append records to JSON Lines file, one compact JSON per line.
+
+        Parameters:
+            file_path (str) : Path of .jsonl file, created if it does not exist
+            records (Iterable) : JSON-serializable records, may be a generator
+
+        Returns:
+            int : Number of appended records
+        """
+        with JSONLWriter(file_path, mode='a') as writer:
+            return writer.write_many(records)
+
+    @staticmethod
+    def open_jsonl_writer(file_path: str, mode: str = 'a', flush_every: int = 0) -> JSONLWriter:
+        """ Open JSONLWriter keeping file open for many writes - use as context manager. """
+        return JSONLWriter(file_path, mode=mode, flush_every=flush_every)
+
+    @staticmethod
+    def iter_json_array(file_path: str, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+        """
+        Incrementally parse file containing one big JSON array (e.g. saved with save_json)
+        and yield its elements one by one, reading the file in chunks.
+
+        Parameters:
+            file_path (str) : Path of JSON file with top-level array
+            chunk_size (int) : Number of characters read at once
+
+        Yields:
+            Each element of the array
+
+        Raises:
+            ValueError: If file does not contain a JSON array or it is malformed
+        """
+        decoder = json.JSONDecoder()
+        with open(file_path, 'r', encoding='utf-8') as file:
+            buffer = file.read(chunk_size).lstrip()
+            eof = False
+            if not buffer.startswith('['):
+                raise ValueError(f"File does not contain JSON array: {file_path}")
+            position = 1
+            expect_element = True
+            after_comma = False
+            while True:
+                # Skip whitespace and separators between elements
+                while True:
+                    while position < len(buffer) and buffer[position] in " \t\r\n":
+                        position += 1
+                    if position < len(buffer) or eof:
+                        break
+                    buffer, position = file.read(chunk_size), 0
+                    eof = not buffer
+                if position >= len(buffer):
+                    raise ValueError(f"Unexpected end of JSON array in file: {file_path}")
+                if buffer[position] == ']':
+                    if after_comma:
+                        raise json.JSONDecodeError(f"Trailing comma in JSON array in file {file_path}", buffer, position)
+                    return
+                if not expect_element:
+                    if buffer[position] != ',':
+                        raise json.JSONDecodeError(f"Expected ',' between JSON array elements in file {file_path}", buffer, position)
+                    position += 1
+                    expect_element = True
+                    after_comma = True
+                    continue
+
+                # Decode next element, reading more data until it is complete
+                while True:
+                    try:
+                        element, end = decoder.raw_decode(buffer, position)
+                        # Element is complete only when followed by a delimiter - number cut at '.' or 'e'
+                        # (or at the end of buffer) may continue in the next chunk
+                        if eof or (end < len(buffer) and buffer[end] in " \t\r\n,]"):
+                            break
+                    except json.JSONDecodeError:
+                        if eof:
+                            logging.error(f"JSON decoding error in file: {file_path}")
+                            raise
+                    chunk = file.read(chunk_size)
+                    eof = not chunk
+                    buffer, position = buffer[position:] + chunk, 0
+                yield element
+                position = end
+                expect_element = False
+                after_comma = False
+
+    @staticmethod
+    def image_bytes_to_data_url(image_bytes: bytes) -> str:
+        """
+        Encodes image already loaded into memory as base64 data URL - lets callers hash and encode
+        the file from one read.
+
+        Params:
+            image_bytes (bytes): Content of the image file
+
+        Returns:
+            str: Base64 encoded image string
+
+        Raises:
+            ValueError: If image format is not supported
+        """
+        image_format = imghdr.what(None, h=image_bytes)
+        supported_formats = ['jpeg', 'png', 'gif', 'bmp']
+        if not image_format or image_format.lower() not in supported_formats:
+            raise ValueError(f"Unsupported image format: {image_format}")
+
+        encoded_image = base64.b64encode(image_bytes).decode("utf-8")
+
+        # Mapowanie formatu obrazu na typ MIME
+        mime_type = f"image/{'jpeg' if image_format == 'jpeg' else image_format}"
+        return f"data:{mime_type};base64,{encoded_image}"
+
     @staticmethod
     def load_image_base64(file_path: str) -> str:
         """
@@ -88,17 +395,8 @@ class FileHandler():
             if not Path(file_path).is_file():
                 raise FileNotFoundError(f"Image file not found at path: {file_path}")
             
-            image_format = imghdr.what(file_path)
-            supported_formats = ['jpeg', 'png', 'gif', 'bmp']
-            if not image_format or image_format.lower() not in supported_formats:
-                raise ValueError(f"Unsupported image format: {image_format}")
-            
             with open(file_path, "rb") as image_file:
-                encoded_image = base64.b64encode(image_file.read()).decode("utf-8")
-
-            # Mapowanie formatu obrazu na typ MIME
-            mime_type = f"image/{'jpeg' if image_format == 'jpeg' else image_format}"
-            data_url = f"data:{mime_type};base64,{encoded_image}"
+                data_url = FileHandler.image_bytes_to_data_url(image_file.read())
             
             logging.info(f"Successfully loaded and encoded image: {file_path}")
             return data_url
@@ -114,7 +412,7 @@ class FileHandler():
             raise
 
     @staticmethod
-    def get_list_file_paths_from_direcotry(directory_path: str, file_extensions: list[str] = None) -> list[str]:
+    def get_list_file_paths_from_direcotry(directory_path: str, file_extensions: list[str] = None, recursive: bool = False, max_workers: int = 1) -> list[str]:
         """
         Gets list of full file paths for files from specific directory.
 
@@ -122,39 +420,20 @@ class FileHandler():
             directory_path (str): Path to directory to scan
             file_extensions (List[str], Optional): List of file extension to filter (e.g. ['.txt', '.png', '.mp3', '.doc'])
                                                     If None -> returns all files path
+            recursive (bool): Include files from subdirectories
+            max_workers (int): Threads scanning subdirectories in parallel (see DirectoryScanner)
 
         Returns:
-            List[str]: List of fill file paths
+            List[str]: List of fill file paths, sorted
 
         Raises:
             FileNotFoundError: If directory doesn't exist
             PermissionError: If no access to directory
         """
         try:
-            # Convert string path to Path object
-            dir_path = Path(directory_path)
-
-            if not dir_path.exists():
-                raise FileNotFoundError(f"Directory not found: {directory_path}")
-            
-            if not dir_path.is_dir():
-                raise NotADirectoryError(f"Path is not a directory: {directory_path}")
-            
-            # Get all files from directory
-            if file_extensions:
-                # If extensions specified, filter files
-                files = [
-                    str(file.absolute())
-                    for file in dir_path.iterdir()
-                    if file.is_file() and file.suffix.lower() in file_extensions
-                ]
-            else:
-                # If no extensions specified, get all files
-                files = [
-                    str(file.absolute())
-                    for file in dir_path.iterdir()
-                    if file.is_file()
-                ]
+            # Symlinked files are listed, as Path.is_file() did before
+            scanner = DirectoryScanner(extensions=file_extensions, recursive=recursive, max_workers=max_workers, follow_symlinks=True)
+            files = [entry.path for entry in scanner.scan(directory_path)]
             logging.info(f"Successfully retrieved {len(files)} files form {directory_path}")
             return files
         
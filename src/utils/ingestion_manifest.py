@@ -0,0 +1,178 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass
+class ManifestDiff:
+    """ Files of a directory compared with the manifest, as lists of file paths (removed - manifest keys). """
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    hashes: Dict[str, str] = field(default_factory=dict)  # file path -> sha256 of current content
+
+    @property
+    def to_process(self) -> List[str]:
+        """ Files which need to be (re)processed - added and changed. """
+        return self.added + self.changed
+
+
+class IngestionManifest:
+    """
+    JSON manifest of ingested files, used to make re-ingestion incremental.
+
+    For every file it keeps the content hash (sha256), the point id and optional extra data
+    (e.g. keywords). Files are identified by their path relative to the root directory
+    (by default directory of the manifest) and point ids are UUIDv5 of that path, so keys and
+    ids do not depend on working directory and re-running ingestion overwrites the same points
+    instead of duplicating them.
+
+    Usage example:
+    manifest = IngestionManifest("tasks/s03e02-semantic_search/ingestion_manifest.json", root="tasks/s03e02-semantic_search/do-not-share")
+    diff = manifest.diff(files)
+    ... process diff.to_process, delete points of diff.removed ...
+    manifest.record(file_path, diff.hashes[file_path])
+    manifest.save()
+    """
+
+    NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "aidevs3/ingestion")
+    VERSION = 1
+    # Schema stored in the file - manifests of different kinds must not be mixed up
+    KIND = "ingestion"
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        """
+        Parameters:
+            path (str) : Path of manifest JSON file, it does not need to exist yet
+            root (str, Optional) : Directory file keys are relative to, by default directory of the manifest
+        """
+        self.path = path
+        self.root = os.path.abspath(root if root is not None else (os.path.dirname(path) or "."))
+        self.files: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            kind = data.get("kind", IngestionManifest.KIND)
+            if kind != self.KIND:
+                raise ValueError(f"{path} is a '{kind}' manifest, expected '{self.KIND}'")
+            self.files = data.get("files", {})
+            logging.info(f"Loaded {self.KIND} manifest with {len(self.files)} files from {path}")
+
+    @staticmethod
+    def relative_key(file_path: str, root: str) -> str:
+        """ Stable identifier of file - path relative to root directory, with forward slashes. """
+        return Path(os.path.relpath(os.path.abspath(file_path), os.path.abspath(root))).as_posix()
+
+    @classmethod
+    def key_point_id(cls, key: str) -> str:
+        """ Deterministic point id - UUIDv5 of file key. """
+        return str(uuid.uuid5(cls.NAMESPACE, key))
+
+    def file_key(self, file_path: str) -> str:
+        """ Key of file in this manifest. """
+        return self.relative_key(file_path, self.root)
+
+    def point_id(self, file_path: str) -> str:
+        """ Deterministic point id of file - UUIDv5 of its key. """
+        return self.key_point_id(self.file_key(file_path))
+
+    @staticmethod
+    def file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """ Hex sha256 of file content, read in chunks. """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def diff(self, file_paths: Iterable[str]) -> ManifestDiff:
+        """
+        Compare current files with the manifest.
+
+        Parameters:
+            file_paths (Iterable[str]) : All files that should be ingested now
+
+        Returns:
+            ManifestDiff : Added, changed, unchanged and removed files with content hashes
+        """
+        result = ManifestDiff()
+        seen = set()
+        for file_path in file_paths:
+            key = self.file_key(file_path)
+            seen.add(key)
+            content_hash = self.file_hash(file_path)
+            result.hashes[file_path] = content_hash
+            entry = self.files.get(key)
+            if entry is None:
+                result.added.append(file_path)
+            elif entry["sha256"] != content_hash:
+                result.changed.append(file_path)
+            else:
+                result.unchanged.append(file_path)
+        result.removed = [key for key in self.files if key not in seen]
+        logging.info(
+            f"Manifest diff: {len(result.added)} added, {len(result.changed)} changed, "
+            f"{len(result.unchanged)} unchanged, {len(result.removed)} removed"
+        )
+        return result
+
+    def get(self, file_path: str) -> Optional[Dict]:
+        """ Return manifest entry of file or None. """
+        return self.files.get(self.file_key(file_path))
+
+    def record(self, file_path: str, content_hash: str, **data) -> None:
+        """
+        Store file as ingested.
+
+        Parameters:
+            file_path (str) : Ingested file
+            content_hash (str) : sha256 of content that was ingested
+            data : Extra JSON-serializable values kept with the entry, e.g. keywords
+        """
+        self.files[self.file_key(file_path)] = {
+            "sha256": content_hash,
+            "point_id": self.point_id(file_path),
+            **data
+        }
+
+    def remove(self, key: str) -> Optional[Dict]:
+        """ Remove entry by file key (as in ManifestDiff.removed), returns removed entry. """
+        return self.files.pop(key, None)
+
+    def save(self) -> None:
+        """ Write manifest atomically - temporary file replaced in one step. """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"version": self.VERSION, "kind": self.KIND, "files": self.files}, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+        logging.info(f"Saved {self.KIND} manifest with {len(self.files)} files to {self.path}")
+
+
+class KeywordCache(IngestionManifest):
+    """
+    Keywords of files keyed by content hash, kept separately from IngestionManifest.
+
+    Entries hold only sha256 and keywords - no point id, because nothing was upserted -
+    so the cache can never make sync_directory skip a file that has no point.
+
+    Usage example:
+    cache = KeywordCache("tasks/s03e01-key_words/content/keywords_cache.json")
+    diff = cache.diff(files)
+    cache.record(file_path, diff.hashes[file_path], keywords=keywords)
+    cache.save()
+    """
+
+    KIND = "keywords"
+
+    def record(self, file_path: str, content_hash: str, **data) -> None:
+        """ Store keywords of file content (data: keywords=[...]). """
+        self.files[self.file_key(file_path)] = {"sha256": content_hash, **data}
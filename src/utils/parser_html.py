@@ -1,35 +1,196 @@
+import io
+import re
+import codecs
+import hashlib
+import logging
 from dataclasses import dataclass
-from typing import Dict, Optional, List
-import uuid
+from html.parser import HTMLParser as StdHTMLParser
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Tuple, Union
 from bs4 import BeautifulSoup
 
-@dataclass
+try:
+    from lxml import etree  # optional, faster C tokenizer for streaming parse
+except ImportError:
+    etree = None
+
+@dataclass(slots=True)
 class MediaPlaceholder:
     type: str # "image" or "audio"
     name: str
     src: str
     caption: Optional[str] = None
     position: int = 0
-    unique_id: str = str(uuid.uuid4())
+    unique_id: str = "" # derived from src and position when empty
     ai_description : Optional[str] = None
 
+    def __post_init__(self):
+        if not self.unique_id:
+            self.unique_id = self.make_id(self.src, self.position)
+
+    @staticmethod
+    def make_id(src: str, position: int) -> str:
+        """ Deterministic id - the same media at the same position of a document always gets the same id. """
+        return hashlib.sha1(f"{src}|{position}".encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def marker(self) -> str:
+        """ Placeholder put into parsed text. """
+        return f"__MEDIA_{self.unique_id}__"
+
+
+class _MediaTextStream:
+    """
+    SAX-style handler turning HTML events into text pieces and media placeholders, in document order.
+
+    Implements the lxml parser target interface (start/end/data/close) and is also driven by
+    the stdlib html.parser adapter. Text of script, style, figcaption and head subtrees is skipped
+    without building any tree - only contents of the currently open figure/audio element is buffered,
+    because its placeholder must precede its text.
+    """
+
+    SKIPPED_TAGS = {"script", "style", "figcaption", "head", "template", "noscript"}
+
+    def __init__(self, create_placeholder: Callable[[str, str, Optional[str]], Optional[str]]):
+        """
+        Parameters:
+            create_placeholder (Callable) : Called with (media_type, src, caption), returns placeholder text or None
+        """
+        self.create_placeholder = create_placeholder
+        self.output: List[str] = []
+        self._text: List[str] = []
+        self._skip_depth = 0
+        self._caption_depth = 0
+        self._caption: List[str] = []
+        self._media: Optional[Dict] = None  # currently open figure or audio element
+
+    def _emit(self, content: str) -> None:
+        if self._media is not None:
+            self._media["buffer"].append(content)
+        else:
+            self.output.append(content)
+
+    def _flush_text(self) -> None:
+        if self._text:
+            text = "".join(self._text).strip()
+            self._text = []
+            if text:
+                self._emit(text)
+
+    def start(self, tag: str, attrib) -> None:
+        self._flush_text()
+        tag = tag.lower()
+        attrib = dict(attrib)
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+            if tag == "figcaption" and self._media is not None and self._media["type"] == "image":
+                self._caption_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if self._media is None and tag in ("figure", "audio"):
+            self._media = {"tag": tag, "type": "image" if tag == "figure" else "audio", "src": "", "buffer": []}
+            if tag == "audio":
+                self._media["src"] = attrib.get("src") or ""
+        elif self._media is not None and not self._media["src"]:
+            if self._media["type"] == "image" and tag == "img":
+                self._media["src"] = attrib.get("src") or ""
+                self._media["has_img"] = True
+            elif self._media["type"] == "audio" and tag == "source":
+                self._media["src"] = attrib.get("src") or ""
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower()
+        if tag in self.SKIPPED_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+            if tag == "figcaption" and self._caption_depth:
+                self._caption_depth -= 1
+            self._text = []
+            return
+        self._flush_text()
+        if self._media is not None and tag == self._media["tag"]:
+            self._close_media()
+
+    def _close_media(self) -> None:
+        media, self._media = self._media, None
+        caption = "".join(self._caption).strip() or None
+        self._caption = []
+        placeholder = None
+        if media["type"] == "image" and media.get("has_img"):
+            placeholder = self.create_placeholder("image", media["src"], caption)
+        elif media["type"] == "audio" and media["src"]:
+            placeholder = self.create_placeholder("audio", media["src"], None)
+        if placeholder:
+            self.output.append(placeholder)
+        self.output.extend(media["buffer"])
+
+    def data(self, data: str) -> None:
+        if self._caption_depth:
+            self._caption.append(data)
+        elif not self._skip_depth:
+            self._text.append(data)
+
+    def close(self) -> None:
+        self._flush_text()
+        if self._media is not None:
+            self._close_media()
+
+
+class _StdlibTokenizer(StdHTMLParser):
+    """ Adapter passing stdlib html.parser events to _MediaTextStream. """
+
+    def __init__(self, handler: _MediaTextStream):
+        super().__init__(convert_charrefs=True)
+        self.handler = handler
+
+    def handle_starttag(self, tag, attrs):
+        self.handler.start(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handler.start(tag, attrs)
+        self.handler.end(tag)
+
+    def handle_endtag(self, tag):
+        self.handler.end(tag)
+
+    def handle_data(self, data):
+        self.handler.data(data)
+
 
 class HTMLParser:
+    # Any media placeholder - ids contain no underscores, so match ends at the closing '__'
+    PLACEHOLDER_PATTERN = re.compile(r"__MEDIA_([0-9A-Za-z-]+)__")
+
     def __init__(self):
+        # Placeholders keyed by unique_id - media with the same file name do not overwrite each other
         self.images_data: Dict[str, MediaPlaceholder] = {}
         self.audio_data: Dict[str, MediaPlaceholder] = {}
+        self.media_index: Dict[str, MediaPlaceholder] = {}
+        self._position_counter = 0
+
+    def _start_document(self) -> None:
+        """ Forget media of previous document - positions (and so ids) are counted per document. """
+        self.images_data = {}
+        self.audio_data = {}
+        self.media_index = {}
         self._position_counter = 0
 
     def _create_placeholder(self, media_type: str, name: str, src: str, caption: str = None):
-        """ Create new media placeholder. """
+        """ Create new media placeholder and register it in the index. """
         self._position_counter += 1
-        return MediaPlaceholder(
+        placeholder = MediaPlaceholder(
             type=media_type,
             name=name,
             src=src,
             caption=caption,
             position=self._position_counter
         )
+        if media_type == "image":
+            self.images_data[placeholder.unique_id] = placeholder
+        else:
+            self.audio_data[placeholder.unique_id] = placeholder
+        self.media_index[placeholder.unique_id] = placeholder
+        return placeholder
     
     def _process_figure(self, figure_element) -> Optional[str]:
         """
@@ -50,9 +211,7 @@ class HTMLParser:
         caption = figure_element.find("figcaption")
         caption_text = caption.get_text().strip() if caption else None
 
-        placeholder = self._create_placeholder('image', name, src, caption_text)
-        self.images_data[name] = placeholder
-        return f"__MEDIA_{placeholder.unique_id}__"
+        return self._create_placeholder('image', name, src, caption_text).marker
     
     def _process_audio(self, audio_element) -> Optional[str]:
         """
@@ -74,9 +233,7 @@ class HTMLParser:
             return None
         
         name = src.split("/")[-1]
-        placeholder = self._create_placeholder("audio", name, src)
-        self.audio_data[name] = placeholder
-        return f"__MEDIA_{placeholder.unique_id}__"
+        return self._create_placeholder("audio", name, src).marker
     
     def _process_text_node(self, element) -> Optional[str]:
         """
@@ -103,10 +260,13 @@ class HTMLParser:
         Returns:
             Parsed text with plaseholders for media
         """
+        self._start_document()
         soup = BeautifulSoup(html_content, 'html.parser')
         text_content : List[str] = []
 
-        for element in soup.body.descendants:
+        # Fragments and some pages have no <body> - walk the whole document then
+        root = soup.body or soup
+        for element in root.descendants:
             content = None
 
             if element.name == 'figure':
@@ -121,14 +281,157 @@ class HTMLParser:
         
         return '\n'.join(filter(None, text_content))
     
+    def _stream_placeholder(self, media_type: str, src: str, caption: Optional[str]) -> str:
+        """ Register media found by streaming parser, same as _process_figure / _process_audio. """
+        name = src.split("/")[-1]
+        return self._create_placeholder(media_type, name, src, caption).marker
+
+    @staticmethod
+    def _iter_source(source, chunk_size: int) -> Iterator[Union[str, bytes]]:
+        """ Yield chunks of str/bytes source or of file handle (text or binary). """
+        if isinstance(source, (str, bytes, bytearray, memoryview)):
+            for start in range(0, len(source), chunk_size):
+                yield source[start:start + chunk_size]
+            return
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def iter_html(
+            self,
+            source: Union[str, bytes, io.IOBase],
+            chunk_size: int = 64 * 1024,
+            encoding: str = "utf-8",
+            backend: str = "auto"
+    ) -> Iterator[str]:
+        """
+        Stream HTML and yield text pieces and media placeholders in document order.
+
+        HTML is fed to an incremental tokenizer chunk by chunk - no tree is built and bytes are
+        decoded incrementally, so memory does not depend on page size. Text of script, style,
+        figcaption and head is skipped, image and audio placeholders are registered in
+        images_data / audio_data like in parse_html_to_text. Works also when <body> is missing.
+
+        Args:
+            source: HTML as str or bytes, or file handle opened in text or binary mode
+            chunk_size: Number of characters/bytes fed at once
+            encoding: Encoding of bytes input
+            backend: 'lxml' (C tokenizer, requires lxml), 'html.parser' (stdlib) or 'auto' - lxml when installed
+
+        Yields:
+            Non-empty stripped text pieces and __MEDIA_<id>__ placeholders
+        """
+        if backend == "auto":
+            backend = "lxml" if etree is not None else "html.parser"
+        self._start_document()
+        handler = _MediaTextStream(self._stream_placeholder)
+
+        if backend == "lxml":
+            if etree is None:
+                raise ImportError("lxml is not installed - use backend='html.parser'")
+            parser = etree.HTMLParser(target=handler, encoding=encoding)
+            feed = parser.feed
+            close = parser.close
+        elif backend == "html.parser":
+            tokenizer = _StdlibTokenizer(handler)
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+            def feed(chunk):
+                tokenizer.feed(decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray, memoryview)) else chunk)
+
+            def close():
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    tokenizer.feed(tail)
+                tokenizer.close()
+                handler.close()
+        else:
+            raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+        for chunk in self._iter_source(source, chunk_size):
+            feed(bytes(chunk) if isinstance(chunk, (bytearray, memoryview)) else chunk)
+            if handler.output:
+                yield from handler.output
+                handler.output = []
+        close()
+        yield from handler.output
+        handler.output = []
+
+    def parse_html_stream(self, source: Union[str, bytes, io.IOBase], **options) -> str:
+        """
+        Streaming counterpart of parse_html_to_text - accepts bytes or file handle as well.
+
+        Args:
+            source: HTML as str or bytes, or file handle
+            options: chunk_size, encoding and backend of iter_html
+
+        Returns:
+            Parsed text with plaseholders for media
+        """
+        return '\n'.join(self.iter_html(source, **options))
+
     def get_image_data(self) -> Dict[str, MediaPlaceholder]:
-        """ Return dictionary containg images data"""
+        """ Return dictionary containg images data, keyed by unique_id """
         return self.images_data
     
     def get_audio_data(self) -> Dict[str, MediaPlaceholder]:
-        """ Returns dictionary containg audio data """
+        """ Returns dictionary containg audio data, keyed by unique_id """
         return self.audio_data
+
+    def get_media(self, unique_id: str) -> Optional[MediaPlaceholder]:
+        """ Return image or audio placeholder with given id, None if not found """
+        return self.media_index.get(unique_id)
+
+    def get_media_by_name(self, name: str) -> List[MediaPlaceholder]:
+        """ Return all placeholders of media file with given name, in document order """
+        return [placeholder for placeholder in self.media_index.values() if placeholder.name == name]
     
+    def _iter_replaced(self, text: str, replacements: Dict[str, str], found: set) -> Iterator[str]:
+        """ Yield pieces of text with placeholders replaced, ids of all seen placeholders are added to found. """
+        position = 0
+        for match in self.PLACEHOLDER_PATTERN.finditer(text):
+            media_id = match.group(1)
+            found.add(media_id)
+            replacement = replacements.get(media_id)
+            if replacement is None:
+                continue
+            yield text[position:match.start()]
+            yield replacement
+            position = match.end()
+        yield text[position:]
+
+    @staticmethod
+    def _replacement_report(replacements: Dict[str, str], found: set) -> Dict[str, List[str]]:
+        report = {
+            "unmatched_placeholders": sorted(found - replacements.keys()),
+            "unused_replacements": sorted(replacements.keys() - found)
+        }
+        if report["unmatched_placeholders"]:
+            ids = report["unmatched_placeholders"]
+            logging.warning(f"No replacement for {len(ids)} media placeholders, e.g. {ids[:10]}")
+        if report["unused_replacements"]:
+            ids = report["unused_replacements"]
+            logging.warning(f"{len(ids)} replacements without placeholder in text, e.g. {ids[:10]}")
+        return report
+
+    def replace_media_placeholders_with_report(self, text: str, replacements: Dict[str, str]) -> Tuple[str, Dict[str, List[str]]]:
+        """
+        Replace media placeholders in one pass over the text and report mismatches.
+
+        Args:
+            text: Text with placeholders
+            replacements: Dictionary mapping unique_id with placeholders content
+
+        Returns:
+            Text with replaced placeholders and report: 'unmatched_placeholders' - ids in text without replacement
+            (left unchanged), 'unused_replacements' - ids of replacements not found in text
+        """
+        found = set()
+        result = "".join(self._iter_replaced(text, replacements, found))
+        return result, self._replacement_report(replacements, found)
+
     def replace_media_placeholders(self, text: str, replacements: Dict[str, str]) -> str:
         """
         Replace media placeholders with actual content
@@ -140,11 +443,34 @@ class HTMLParser:
         Returns:
             Text with replaced placeholders
         """
+        return self.replace_media_placeholders_with_report(text, replacements)[0]
 
-        result = text
-        for media_id, replacement in replacements.items():
-            placeholder = f"__MEDIA_{media_id}__"
-            result = result.replace(placeholder, replacement)
-        return result
+    def write_replaced_media_placeholders(
+            self,
+            content: Union[str, Iterable[str]],
+            replacements: Dict[str, str],
+            file_path: str,
+            separator: str = "\n"
+    ) -> Dict[str, List[str]]:
+        """
+        Replace media placeholders and write result straight to file, without building the output string.
 
+        Args:
+            content: Text with placeholders or its pieces, e.g. iter_html() output (each piece must contain whole placeholders)
+            replacements: Dictionary mapping unique_id with placeholders content
+            file_path: Destination file
+            separator: Written between pieces of iterable content
 
+        Returns:
+            Report as in replace_media_placeholders_with_report
+        """
+        pieces = [content] if isinstance(content, str) else content
+        found = set()
+        with open(file_path, 'w', encoding='utf-8') as file:
+            for number, piece in enumerate(pieces):
+                if number:
+                    file.write(separator)
+                for part in self._iter_replaced(piece, replacements, found):
+                    file.write(part)
+        logging.info(f"Successfully saved enriched content: {file_path}")
+        return self._replacement_report(replacements, found)
@@ -1,13 +1,41 @@
 import re
 import logging
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+try:
+    import tiktoken  # optional, exact token counts for OpenAI models
+except ImportError:
+    tiktoken = None
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str, flags: int = 0) -> "re.Pattern":
+    """ Registry of compiled regular expressions - every pattern is compiled once per process. """
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=256)
+def tag_pattern(tag: str) -> "re.Pattern":
+    """ Compiled pattern of <tag>content</tag>. """
+    escaped = re.escape(tag)
+    return re.compile(rf"<{escaped}>(.*?)</{escaped}>", re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def opening_tags_pattern(tags: tuple) -> "re.Pattern":
+    """ Compiled pattern matching opening tag of any of tags. """
+    return re.compile("<(" + "|".join(re.escape(tag) for tag in tags) + ")>")
+
 
 class TextProcessor:
     """
     Class for text processing and analysis.
 
     Main functionalities:
-    - Extract content between special tags
-    - (future features)
+    - Extract content between special tags (precompiled patterns, many tags in one scan)
+    - Estimate number of tokens in text
+    - Split text into paragraphs (see TextChunker for token-limited chunks)
     """
 
     @staticmethod
@@ -23,13 +51,89 @@ class TextProcessor:
             str: Content between the tags, or an empty string if not found.
         """
         try:
-            pattern = rf"<{tag}>(.*?)</{tag}>"
-            match = re.search(pattern, text, re.DOTALL)
+            match = tag_pattern(tag).search(text)
             return match.group(1).strip() if match else ""
         except Exception as e:
             logging.error(f"Error during tag extraction: {e}")
             raise
 
+    @staticmethod
+    def extract_tags(text: str, tags: Sequence[str]) -> Dict[str, str]:
+        """
+        Extract content of several tags with one scan of the text, e.g. answer and keywords of one LLM response.
+        For every tag result is the same as of extract_text_between_tags (first occurrence, also when nested in other tag).
+
+        Parameters:
+            text (str) - Input text containing tags
+            tags (Sequence[str]) - Tag names, e.g. ['answer', 'keywords', 'Result']
+
+        Return
+            Dict[str, str]: Content of each tag, empty string for tags not found
+        """
+        result = {tag: "" for tag in tags}
+        if not tags:
+            return result
+        found = set()
+        for match in opening_tags_pattern(tuple(dict.fromkeys(tags))).finditer(text):
+            tag = match.group(1)
+            if tag in found:
+                continue
+            found.add(tag)
+            close = text.find(f"</{tag}>", match.end())
+            if close != -1:
+                result[tag] = text[match.end():close].strip()
+            if len(found) == len(result):
+                break
+        return result
+
+    @staticmethod
+    def extract_all(text: str, tag: str) -> List[str]:
+        """
+        Extract content of every occurrence of tag.
+
+        Parameters:
+            text (str) - Input text containing tags
+            tag (str) - The tag name
+
+        Return
+            List[str]: Stripped content of each <tag>...</tag>, in text order
+        """
+        return [match.group(1).strip() for match in tag_pattern(tag).finditer(text)]
+
+    @staticmethod
+    def extract_numbered_tags(text: str, tag: str) -> dict:
+        """
+        Extract content of all numbered tags, e.g. <keywords id="2">...</keywords>.
+
+        Parameters:
+            text (str) - Input text containing tags
+            tag (str) - The tag name to extract content from
+
+        Return
+            Dict[int, str]: Content of each tag by its id (first occurrence wins)
+        """
+        escaped = re.escape(tag)
+        pattern = compile_pattern(rf"<{escaped}\s+id\s*=\s*[\"']?(\d+)[\"']?\s*>(.*?)</{escaped}>", re.DOTALL)
+        result = {}
+        for match in pattern.finditer(text):
+            result.setdefault(int(match.group(1)), match.group(2).strip())
+        return result
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Fast estimation of the number of tokens in text (about 4 characters per token for OpenAI models).
+
+        Parameters:
+            text (str) : Text to estimate
+
+        Returns:
+            int: Estimated number of tokens
+        """
+        if not text:
+            return 0
+        return len(text) // 4 + 1
+
     @staticmethod
     def split_text_into_chanks(text: str, end_signs: str = "\n") -> list:
         """
@@ -64,6 +168,32 @@ class TextProcessor:
             logging.error(f"Error during text splitting: {e}")
             raise
 
+    @staticmethod
+    def iter_chanks(pieces: Iterable[str], end_signs: str = "\n") -> Iterator[str]:
+        """
+        Lazy version of split_text_into_chanks - splits stream of text pieces (e.g. file chunks)
+        into the same paragraphs, holding only the current unfinished paragraph in memory.
+
+        Parameters:
+            pieces (Iterable[str]) : Consecutive parts of text, e.g. FileHandler.iter_text_chunks
+            end_signs (str) : End line signs, base on which methode splitting the text
+
+        Yields:
+            str : Stripped, non-empty paragraphs / chanks
+        """
+        if not end_signs:
+            raise ValueError("end_signs must not be empty")
+        rest = ""
+        for piece in pieces:
+            rest += piece
+            parts = rest.split(end_signs)
+            rest = parts.pop()
+            for part in parts:
+                if part.strip():
+                    yield part.strip()
+        if rest.strip():
+            yield rest.strip()
+
     @staticmethod
     def check_text_contain(text: str, phrase: str) -> bool:
         """
@@ -104,7 +234,7 @@ class TextProcessor:
                 return []
             
             # Split text using regex pattern 
-            raw_tokens = re.split(delimiter, text)
+            raw_tokens = compile_pattern(delimiter).split(text)
 
             # Initialize empty list for cleaned tokens
             tokens = []
@@ -124,6 +254,222 @@ class TextProcessor:
         except Exception as e:
             logging.error(f"Error during text tokenization: {e}")
             raise
-                          
-        
 
+
+@dataclass(frozen=True)
+class TextChunk:
+    """ Chunk of text with character offsets in the source text: source[start:end] == text. """
+    index: int
+    text: str
+    start: int
+    end: int
+    tokens: int
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int
+    tokens: int
+    boundary: int  # strength of boundary after segment, lower is stronger (0 - paragraph)
+    overlap: bool = False
+    gap: int = 0  # tokens of whitespace between previous segment and this one
+
+
+class TextChunker:
+    """
+    Splits text into chunks under a token budget, for embeddings and LLM calls.
+
+    Text is cut at the strongest boundary available - paragraphs, then lines, sentences,
+    words and finally characters - and small pieces are packed together up to max_tokens.
+    A chunk is ended at an earlier paragraph/sentence boundary rather than in the middle of
+    one, as long as it stays at least min_fill full. Consecutive chunks can share
+    overlap_tokens of text. Tokens are counted with tiktoken when it is installed, otherwise
+    estimated with TextProcessor.estimate_tokens. Every chunk keeps its character offsets
+    in the source, so search hits can be mapped back to the document.
+
+    Usage example:
+    chunker = TextChunker(max_tokens=300, overlap_tokens=30)
+    for chunk in chunker.chunk(text):
+        print(chunk.start, chunk.end, chunk.tokens)
+    # streaming input, e.g. large file
+    chunks = chunker.iter_chunks(FileHandler.iter_text_chunks("transcript.txt"))
+    """
+
+    BOUNDARIES = [
+        re.compile(r"\n[ \t\r\f\v]*\n\s*"),   # paragraphs
+        re.compile(r"\n\s*"),                  # lines
+        re.compile(r"(?<=[.!?\u2026])\s+"),     # sentences
+        re.compile(r"\s+"),                     # words
+    ]
+
+    def __init__(
+            self,
+            max_tokens: int = 512,
+            overlap_tokens: int = 0,
+            min_fill: float = 0.5,
+            encoding_name: str = "cl100k_base",
+            token_counter: Optional[Callable[[str], int]] = None
+    ):
+        """
+        Parameters:
+            max_tokens (int) : Token budget of a chunk
+            overlap_tokens (int) : Tokens of previous chunk repeated at the start of next one
+            min_fill (float) : Fraction of max_tokens a chunk must have to be ended at a stronger, earlier boundary
+            encoding_name (str) : tiktoken encoding used when tiktoken is installed
+            token_counter (Callable, Optional) : Custom function counting tokens of text
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_fill = min_fill
+        if token_counter is not None:
+            self.count_tokens = token_counter
+        elif tiktoken is not None:
+            encoding = tiktoken.get_encoding(encoding_name)
+            self.count_tokens = lambda text: len(encoding.encode(text, disallowed_special=()))
+        else:
+            self.count_tokens = TextProcessor.estimate_tokens
+
+    def _segments(self, text: str, start: int, end: int, level: int, boundary: int) -> Iterator[_Segment]:
+        """ Split text[start:end] into stripped segments of at most max_tokens, at the strongest possible boundaries. """
+        # Strip whitespace, offsets point at the visible text
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start >= end:
+            return
+        tokens = self.count_tokens(text[start:end])
+        if tokens <= self.max_tokens:
+            yield _Segment(start, end, tokens, boundary)
+            return
+
+        if level < len(self.BOUNDARIES):
+            pieces, position = [], start
+            for match in self.BOUNDARIES[level].finditer(text, start, end):
+                pieces.append((position, match.start()))
+                position = match.end()
+            pieces.append((position, end))
+            if len(pieces) > 1:
+                for number, (piece_start, piece_end) in enumerate(pieces):
+                    piece_boundary = level if number < len(pieces) - 1 else boundary
+                    yield from self._segments(text, piece_start, piece_end, level + 1, piece_boundary)
+                return
+            yield from self._segments(text, start, end, level + 1, boundary)
+            return
+
+        # No boundary left (e.g. very long word) - cut by characters
+        position = start
+        while position < end:
+            size = max(1, min(end - position, self.max_tokens * 4))
+            while size > 1 and self.count_tokens(text[position:position + size]) > self.max_tokens:
+                size = size * 3 // 4
+            piece_end = position + size
+            yield _Segment(position, piece_end, self.count_tokens(text[position:piece_end]), len(self.BOUNDARIES) if piece_end < end else boundary)
+            position = piece_end
+
+    @staticmethod
+    def _group_tokens(group: List[_Segment]) -> int:
+        """ Tokens of text spanned by segments - segments and whitespace between them. """
+        return sum(segment.tokens + segment.gap for segment in group) - group[0].gap if group else 0
+
+    def _cut_index(self, current: List[_Segment]) -> int:
+        """ Index of last segment of chunk to emit - strongest boundary leaving chunk at least min_fill full. """
+        first = next(index for index, segment in enumerate(current) if not segment.overlap)
+        best, best_boundary, filled = len(current) - 1, None, 0
+        for index, segment in enumerate(current):
+            filled += segment.tokens + (segment.gap if index else 0)
+            if index < first or filled < self.min_fill * self.max_tokens:
+                continue
+            if best_boundary is None or segment.boundary <= best_boundary:
+                best, best_boundary = index, segment.boundary
+        return best
+
+    def _overlap_tail(self, emitted: List[_Segment]) -> List[_Segment]:
+        tail, tokens = [], 0
+        for segment in reversed(emitted):
+            if tokens + segment.tokens > self.overlap_tokens:
+                break
+            tokens += segment.tokens + segment.gap
+            tail.insert(0, _Segment(segment.start, segment.end, segment.tokens, segment.boundary, overlap=True, gap=segment.gap))
+        return tail
+
+    def _pack(self, text: str, segments: Iterable[_Segment]) -> Iterator[List[_Segment]]:
+        """ Greedily pack segments into groups fitting max_tokens. """
+        current: List[_Segment] = []
+        previous_end = None
+        for segment in segments:
+            if previous_end is not None and segment.start > previous_end:
+                segment.gap = self.count_tokens(text[previous_end:segment.start])
+            previous_end = segment.end
+            while current and self._group_tokens(current) + segment.gap + segment.tokens > self.max_tokens:
+                if all(item.overlap for item in current):
+                    current.pop(0)
+                    continue
+                cut = self._cut_index(current)
+                emitted, current = current[:cut + 1], current[cut + 1:]
+                yield emitted
+                if self.overlap_tokens:
+                    current = self._overlap_tail(emitted) + current
+            current.append(segment)
+        if current and not all(item.overlap for item in current):
+            yield current
+
+    def _make_chunk(self, text: str, group: List[_Segment], index: int, offset: int) -> TextChunk:
+        start, end = group[0].start, group[-1].end
+        chunk_text = text[start:end]
+        tokens = self.count_tokens(chunk_text) if len(group) > 1 else group[0].tokens
+        return TextChunk(index=index, text=chunk_text, start=offset + start, end=offset + end, tokens=tokens)
+
+    def chunk(self, text: str) -> List[TextChunk]:
+        """
+        Split text into chunks.
+
+        Parameters:
+            text (str) : Text to split
+
+        Returns:
+            List[TextChunk] : Chunks in text order, with offsets in text
+        """
+        if not text:
+            return []
+        groups = self._pack(text, self._segments(text, 0, len(text), 0, 0))
+        return [self._make_chunk(text, group, index, 0) for index, group in enumerate(groups)]
+
+    def iter_chunks(self, source: Union[str, Iterable[str]], window_chars: Optional[int] = None) -> Iterator[TextChunk]:
+        """
+        Split text given as string or stream of pieces (e.g. FileHandler.iter_text_chunks) into chunks lazily.
+        Only a window of text is held in memory - chunks are emitted as soon as text after them has arrived.
+
+        Parameters:
+            source (str or Iterable[str]) : Text or consecutive parts of text
+            window_chars (int, Optional) : Characters buffered before chunking, by default about 8 chunks
+
+        Yields:
+            TextChunk : Chunks in text order, offsets in the whole streamed text
+        """
+        if isinstance(source, str):
+            yield from self.chunk(source)
+            return
+        window_chars = window_chars or self.max_tokens * 4 * 8
+        buffer, offset, index = "", 0, 0
+        for piece in source:
+            buffer += piece
+            if len(buffer) < window_chars:
+                continue
+            groups = list(self._pack(buffer, self._segments(buffer, 0, len(buffer), 0, 0)))
+            # Last chunk may continue in next pieces - it is chunked again together with them
+            for group in groups[:-1]:
+                yield self._make_chunk(buffer, group, index, offset)
+                index += 1
+            if len(groups) > 1:
+                keep_from = groups[-1][0].start
+                buffer, offset = buffer[keep_from:], offset + keep_from
+        if buffer:
+            for group in self._pack(buffer, self._segments(buffer, 0, len(buffer), 0, 0)):
+                yield self._make_chunk(buffer, group, index, offset)
+                index += 1
@@ -1,7 +1,13 @@
 import os
 import sys
+import json
+import time
+import hashlib
 import logging
-from typing import List, Tuple, Optional, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple, Optional, Dict
 from pathlib import Path
 
 # Add project root to Python path
@@ -14,6 +20,34 @@ from src.utils.parser_html import HTMLParser, MediaPlaceholder
 
 logging.basicConfig(level=logging.INFO)
 
+
+@dataclass
+class MediaEnrichment:
+    """ Outcome of one media placeholder - description or error, with time spent in each step (seconds). """
+    unique_id: str
+    name: str
+    type: str
+    description: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=lambda: {"read": 0.0, "encode": 0.0, "request": 0.0, "parse": 0.0})
+
+
+@dataclass
+class EnrichmentReport:
+    """ Result of enrichment stage - outcome per placeholder and wall time of the whole stage. """
+    items: List[MediaEnrichment] = field(default_factory=list)
+    total_time: float = 0.0
+
+    @property
+    def failed(self) -> List[MediaEnrichment]:
+        return [item for item in self.items if item.error is not None]
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
 class ContentEnricher:
     """ Class responsible for enriching web content with AI-generated description of images and audio transcription """
     def __init__(self, 
@@ -21,13 +55,23 @@ class ContentEnricher:
                  vlm_system_prompt_path: str,
                  web_content_path: str, 
                  images_path: str, 
-                 dst_path: str):
+                 dst_path: str,
+                 audio_path: Optional[str] = None,
+                 transcribe: Optional[Callable[[str], str]] = None,
+                 max_workers: int = 8,
+                 cache_path: Optional[str] = None,
+                 vlm_model: str = "gpt-4o"):
         """ Initialize ContentEnricher with necessary paths and clients.
         Args:
             vlm_system_prompt_path : Path to VLM prompt file
             llm_system_prompt_path : Path to LLM prompt file
             web_content_path : Path to text file containg website HTML description
             images_path : Path fo directory containg images downloaded from website
+            audio_path : Path to directory containg audio files downloaded from website, needed for transcription
+            transcribe : Returns transcription text for audio file path, e.g. lambda path: stt_service.transcription(path, "pl")["text"]
+            max_workers : Number of media items processed at the same time
+            cache_path : JSON file with descriptions keyed by VLM model, prompt hash and image content hash, reused between runs
+            vlm_model : Vision model used for image descriptions
         """
         self._validate_paths(
             llm_system_prompt_path,
@@ -48,6 +92,19 @@ class ContentEnricher:
         except FileNotFoundError as e:
             logging.error(f"Failed to load required files: {e}")
             raise
+        self.audio_path = audio_path
+        self.transcribe = transcribe
+        self.max_workers = max(1, max_workers)
+        self.cache_path = cache_path
+        self.vlm_model = vlm_model
+        # Descriptions depend on model and prompt as well - changing them must not serve old descriptions
+        self._cache_prefix = f"{vlm_model}:{hashlib.sha256(self.vlm_system_prompt.encode('utf-8')).hexdigest()[:16]}:"
+        self._cache: Dict[str, str] = self._load_cache(cache_path)
+        self._cache_lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        self.last_report: Optional[EnrichmentReport] = None
+        # Local speech-to-text models are usually not thread-safe - transcriptions run one at a time
+        self._transcribe_lock = threading.Lock()
 
     @staticmethod
     def _validate_paths(*paths: str) -> None:
@@ -56,21 +113,43 @@ class ContentEnricher:
             if not Path(path).exists():
                 raise FileNotFoundError(f"Path does not exist: {path}")
 
-    def process_vlm(self, file_path: str) -> str:
+    @staticmethod
+    def _load_cache(cache_path: Optional[str]) -> Dict[str, str]:
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        return {}
+
+    def _save_cache(self) -> None:
+        """ Save description cache atomically (if cache_path is set). """
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with self._cache_lock:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(self._cache, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.cache_path)
+
+    def process_vlm(self, file_path: str = "", image_data_url: Optional[str] = None) -> str:
         """ Generate description for an image using Vision Language Model.
         Args:
             file_path : Path to the image
+            image_data_url : Already encoded image, file_path is not read then
 
         Returns:
             str: AI-generated description of the image
         """
         vlm_description = self.client_openai.generate_visual_resposne(
             prompt=self.vlm_system_prompt,
-            model="gpt-4o",
+            model=self.vlm_model,
             image_path=file_path,
             max_tokens=2000,
             temperature=1.0,
-            top_p=1.0
+            top_p=1.0,
+            image_data_url=image_data_url
         )
         logging.info(f"VLM description: {vlm_description}")
         return vlm_description
@@ -80,38 +159,153 @@ class ContentEnricher:
         Returns:
             tuple: (parsed_content, images_data, audio_data)
                 - parsed_content (str): website content as text
-                - images_data (dict): dictionary containg list of image placeholders
-                - audio_data (dict): dictionary containg list of audio placeholders
+                - images_data (dict): dictionary of image placeholders keyed by unique_id
+                - audio_data (dict): dictionary of audio placeholders keyed by unique_id
         """
         web_content = self.parser.parse_html_to_text(self.web_content_to_parse)
         images_list = self.parser.get_image_data()
         audio_list = self.parser.get_audio_data()
         return web_content, images_list, audio_list
     
-    def processs_image_palceholder(self, image_data: Dict[str, MediaPlaceholder]) -> None:
+    def _describe_image(self, content_hash: str, image_bytes: bytes, timings: Dict[str, float]) -> Tuple[str, bool]:
+        """ Return VLM description of image and whether it came from cache. Identical images are sent once. """
+        cache_key = self._cache_prefix + content_hash
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached, True
+
+        start = time.perf_counter()
+        image_data_url = self.handler.image_bytes_to_data_url(image_bytes)
+        timings["encode"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        vlm_response = self.process_vlm(image_data_url=image_data_url)
+        timings["request"] += time.perf_counter() - start
+
+        with self._cache_lock:
+            self._cache[cache_key] = vlm_response
+        return vlm_response, False
+
+    def _transcribe_audio(self, audio_path: str, timings: Dict[str, float]) -> str:
+        start = time.perf_counter()
+        with self._transcribe_lock:
+            transcription = self.transcribe(audio_path)
+        timings["request"] += time.perf_counter() - start
+        return transcription
+
+    def _hash_lock(self, content_hash: str) -> threading.Lock:
+        with self._cache_lock:
+            return self._hash_locks.setdefault(content_hash, threading.Lock())
+
+    def _drop_hash_lock(self, content_hash: str, lock: threading.Lock) -> None:
+        """ Forget lock of image once it is described - later workers find the description in cache. """
+        with self._cache_lock:
+            if self._hash_locks.get(content_hash) is lock:
+                del self._hash_locks[content_hash]
+
+    def _process_placeholder(self, placeholder: MediaPlaceholder) -> MediaEnrichment:
+        """ Describe or transcribe one media item, errors are reported instead of raised. """
+        result = MediaEnrichment(unique_id=placeholder.unique_id, name=placeholder.name, type=placeholder.type)
+        try:
+            if placeholder.type == "image":
+                image_path = os.path.join(self.images_path, placeholder.name)
+                start = time.perf_counter()
+                with open(image_path, "rb") as file:
+                    image_bytes = file.read()
+                content_hash = hashlib.sha256(image_bytes).hexdigest()
+                result.timings["read"] += time.perf_counter() - start
+
+                # Workers with the same image wait for the first one and take its description from cache
+                hash_lock = self._hash_lock(content_hash)
+                try:
+                    with hash_lock:
+                        vlm_response, result.cached = self._describe_image(content_hash, image_bytes, result.timings)
+                finally:
+                    self._drop_hash_lock(content_hash, hash_lock)
+
+                start = time.perf_counter()
+                result.description = f"Nazwa zdjęcia: {placeholder.name}, podpis: {placeholder.caption}, dokładny opis: {vlm_response}"
+                result.timings["parse"] += time.perf_counter() - start
+            else:
+                audio_path = os.path.join(self.audio_path, placeholder.name)
+                if not os.path.exists(audio_path):
+                    raise FileNotFoundError(f"Audio file not found: {audio_path}")
+                transcription = self._transcribe_audio(audio_path, result.timings)
+
+                start = time.perf_counter()
+                result.description = f"Nagranie audio: {placeholder.name}, transkrypcja: {transcription.strip()}"
+                result.timings["parse"] += time.perf_counter() - start
+            placeholder.ai_description = result.description
+            logging.info(
+                f"Generated description for {placeholder.type}: {placeholder.name} "
+                f"(read {result.timings['read']:.3f}s, encode {result.timings['encode']:.3f}s, request {result.timings['request']:.2f}s, "
+                f"parse {result.timings['parse']:.3f}s{', cached' if result.cached else ''})"
+            )
+        except Exception as e:
+            result.error = str(e)
+            logging.error(f"Failed to process {placeholder.type} {placeholder.name}: {e}")
+        return result
+
+    def process_media_placeholders(
+            self,
+            image_data: Dict[str, MediaPlaceholder],
+            audio_data: Optional[Dict[str, MediaPlaceholder]] = None
+    ) -> EnrichmentReport:
+        """ Fill ai_description of image and audio placeholders concurrently.
+
+        Images are read once, hashed and encoded in memory - descriptions are cached by content hash,
+        so repeated images are sent to VLM only once. Audio is transcribed only when transcribe and
+        audio_path were given. Failed items do not stop the others.
+
+        Args:
+            image_data: Dictionary of image placeholders keyed by unique_id
+            audio_data: Dictionary of audio placeholders keyed by unique_id
+
+        Returns:
+            EnrichmentReport: Outcome and timing breakdown per placeholder, in document order
+        """
+        placeholders = list(image_data.values())
+        if audio_data:
+            if self.transcribe is not None and self.audio_path:
+                placeholders.extend(audio_data.values())
+            else:
+                logging.warning(f"Skipping {len(audio_data)} audio placeholders - transcribe and audio_path are not set")
+        placeholders.sort(key=lambda placeholder: placeholder.position)
+
+        report = EnrichmentReport()
+        if not placeholders:
+            return report
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(placeholders))) as executor:
+            report.items = list(executor.map(self._process_placeholder, placeholders))
+        report.total_time = time.perf_counter() - start
+        self._save_cache()
+
+        request_time = sum(item.timings["request"] for item in report.items)
+        logging.info(
+            f"Enriched {len(report.items) - len(report.failed)}/{len(report.items)} media items in {report.total_time:.2f}s "
+            f"(sum of request times {request_time:.2f}s, {sum(item.cached for item in report.items)} from cache)"
+        )
+        if report.failed:
+            logging.warning(f"Failed media items: {[item.name for item in report.failed]}")
+        return report
+
+    def processs_image_palceholder(self, image_data: Dict[str, MediaPlaceholder]) -> EnrichmentReport:
         """ Process image placeholder - adding image description into placeholder ai_description pole in MediaPlaceholder object
         
         Args:
-            image_data: Dictionatry of image placeholders where key is image name and value is MediaPlacehoder object
-        """
-        for image_name, placeholder in image_data.items():
-            image_path = os.path.join(self.images_path, image_name)
+            image_data: Dictionatry of image placeholders where key is unique_id and value is MediaPlacehoder object
 
-            if os.path.exists(image_path):
-                try:
-                    vlm_response = self.process_vlm(image_path)
-                    caption = placeholder.caption
-                    description = f"Nazwa zdjęcia: {image_name}, podpis: {caption}, dokładny opis: {vlm_response}"
-                    placeholder.ai_description = description
-                    logging.info(f"Generated description for image: {image_name}")
-                except Exception as e:
-                    logging.error(f"Failed to process image {image_name}: {e}")
-            else:
-                logging.warning(f"Image file not found: {image_path}")
+        Returns:
+            EnrichmentReport: Outcome of each image, see process_media_placeholders
+        """
+        return self.process_media_placeholders(image_data)
 
     
     def enrich_content(self) -> str:
-        """ Process HTML content and replace image placeholders woth their descriptions
+        """ Process HTML content and replace image (and audio) placeholders woth their descriptions.
+        Report of the enrichment stage is kept in last_report.
         
         Returns:
             str: Enriched content with image descriptions located in proper places in text
@@ -123,18 +317,18 @@ class ContentEnricher:
     
         try:
         # Parse HTML content and get media data
-            parsed_content, images_data, _ = self.parse_html_to_text()
+            parsed_content, images_data, audio_data = self.parse_html_to_text()
             if not parsed_content:
                 raise ValueError("Failed to parse HTML content - empty result")
             
-            # Process images and generate descriptions
-            self.processs_image_palceholder(images_data)
+            # Process media concurrently and generate descriptions
+            self.last_report = self.process_media_placeholders(images_data, audio_data)
 
-            # create replacements direcotry from processed images
+            # create replacements direcotry from processed media
             replacements = {
-                placeholder.unique_id: placeholder.ai_description
-                for placeholder in images_data.values()
-                if placeholder.ai_description is not None
+                item.unique_id: item.description
+                for item in self.last_report.items
+                if item.description is not None
             }
 
             if not replacements and images_data:
@@ -16,6 +16,8 @@ sys.path.append(project_root)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 from src.services.key_words.metadata_builder import MetadataBuilder
+from src.services.key_words.keyword_set import KeywordSet
+from src.services.key_words.inverted_index import InvertedIndex
 from src.utils.file_handler import FileHandler
 from src.api.aidevs3.uploader import Uploader
 
@@ -31,41 +33,37 @@ def create_metadata_json_facts_dir():
 
 
 def cross_reference_keywords():
-
     """
-    
-    Metoda do poprawy - nie działa do końca poprawnie.
-    
+    Extend keywords of every report with keywords of all facts sharing any keyword with it.
+    Facts are kept in inverted index (keyword -> facts), saved next to facts.json and updated incrementally.
     """
     reports_json_path = "tasks/s03e01-key_words/content/reports.json"
     facts_json_path = "tasks/s03e01-key_words/content/facts.json"
+    facts_index_path = "tasks/s03e01-key_words/content/facts_index.json"
     
     file_handler = FileHandler()
 
     reports = file_handler.load_json(reports_json_path)
     facts = file_handler.load_json(facts_json_path)
 
-    # Create a mapping of keywords to their full keyword lists from facts
-    keyword_to_full_list = {}
-    for fact in facts:
-        for keyword in fact['keywords']:
-            keyword_to_full_list[keyword.lower()] = fact['keywords']
+    # Index keywords of facts - only new or changed facts are re-indexed
+    facts_index = InvertedIndex.load(facts_index_path)
+    if facts_index.update_from_metadata(facts, remove_missing=True):
+        facts_index.save(facts_index_path)
 
     # Process each report
     for report in reports:
-        matched_keywords = set()  # Using set to avoid duplicates
+        # Ordered, case-insensitive set - keeps report keywords first, without duplicates
+        keywords = KeywordSet(report['keywords'])
         
-        # Check each report keyword against facts keywords
-        for report_keyword in report['keywords']:
-            report_keyword_lower = report_keyword.lower()
-            if report_keyword_lower in keyword_to_full_list:
-                # Add all keywords from the matching fact
-                matched_keywords.update(keyword_to_full_list[report_keyword_lower])
+        # Add keywords of every fact matching any report keyword
+        for fact_id in facts_index.query_or(report['keywords']):
+            keywords.update(facts_index.keywords_of(fact_id))
         
         # Update report keywords with matched keywords
-        report['keywords'] = list(set(report['keywords']) | matched_keywords)
+        report['keywords'] = keywords.to_list()
 
-    file_handler.save_json("tasks/s03e01-key_words/content/final.json", report)
+    file_handler.save_json("tasks/s03e01-key_words/content/final.json", reports)
 
 def analyze_final_json():
     """
@@ -19,6 +19,7 @@ from src.api.qdrant.client import QdrantClient
 from src.api.qdrant.point_struct_generator import PointStructBuilder
 from src.api.openai.client import OpenAIClient
 from src.api.aidevs3.uploader import Uploader
+from src.services.semantic_search.question_search import QuestionSearcher
 
 def qdrant_test():
     qdrant_client = QdrantClient()
@@ -75,6 +76,16 @@ def qdrant_search():
     data = filename.removesuffix('.txt')
     return data.replace("_", '-')
 
+def qdrant_search_questions(questions: list) -> list:
+    """ Answer many questions with one batched embedding call and one batch search request. """
+    searcher = QuestionSearcher()
+    collection_name = "s03e02"
+    answers = searcher.search_questions(collection_name, questions, limit=1)
+    return [
+        answer[0]["payload"]["filename"].removesuffix('.txt').replace("_", '-') if answer else None
+        for answer in answers
+    ]
+
 def sent_data_to_aidevs3():
     taskname = "wektory"
     uploader = Uploader(taskname)
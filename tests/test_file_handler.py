@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+
+import pytest
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from src.utils.file_handler import FileHandler
+
+FLOAT_ARRAYS = [
+    [1.5, 2],
+    [3.14159],
+    [1e10],
+    [1.5e-3, 2.25e+4, -0.5, 0.0, -1e-10],
+    [0.1 * index for index in range(200)],
+]
+
+
+@pytest.mark.parametrize("values", FLOAT_ARRAYS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+def test_iter_json_array_round_trips_floats_across_chunk_boundaries(tmp_path, values, chunk_size):
+    path = tmp_path / "floats.json"
+    path.write_text(json.dumps(values), encoding="utf-8")
+    assert list(FileHandler.iter_json_array(str(path), chunk_size=chunk_size)) == values
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3])
+def test_iter_json_array_rejects_trailing_comma(tmp_path, chunk_size):
+    path = tmp_path / "invalid.json"
+    path.write_text("[1.5, 2,]", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(FileHandler.iter_json_array(str(path), chunk_size=chunk_size))